@@ -0,0 +1,222 @@
+"""
+Benchmarks of the calculus package, run on a host:
+
+    python benchmark.py [--output results.json] [--compare baseline.json]
+
+Measures parsing, evaluation, differentiation and simplification for a
+corpus of expressions covering every node type, the size of the
+derivative trees before and after simplifying, their depth and the peak
+allocations. Results are written as JSON, comparing them with the
+results of another commit prints the change of every metric.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from calculus import infix, simplifier
+from calculus.expression import Expression, _parse, reset_caches
+from calculus.nodes import Variable
+from calculus.tokens import OPERATIONS
+
+# name and infix-notation, together using every node
+CORPUS = (
+    ('polynomial', '3*x^2 - ln(4)'),
+    ('sine', '15*sin(0.1*x)'),
+    ('quotient', '-cos(x)/tan(x+1)'),
+    ('inverse_trig', 'arcsin(x/2) + arccos(x/2) + arctan(x)'),
+    ('log_root', 'log(2, x) + nrt(3, x^2 + 1)'),
+    ('constants', 'sqrt(x) * e^x - pi'),
+    ('power_quotient', 'sin(x)^x / ln(x)'),
+    ('nested_power', '(x^3 - 2*x + 1)^4'),
+    ('self_power', 'x^x'),
+)
+
+# values of x, within the domain of every expression of the corpus
+VALUES = (0.15, 0.35, 0.55, 0.75, 0.95)
+# highest derivative measured
+ORDER = 3
+# minimum time per measurement in s
+DURATION = 0.2
+
+# token type of each node
+_TYPES = dict((node, type_) for type_, (node, _) in OPERATIONS.items())
+
+
+def to_rpn(tree):
+    """Converts a tree into tokens in RPN-Notation, as sent by the app."""
+    if isinstance(tree, Variable):
+        return ['(VAR:x)']
+    if tree.__class__ not in _TYPES:
+        return ['(VAL:{!r})'.format(tree.evaluate(0))]
+    tokens = []
+    for child in tree.children():
+        tokens.extend(to_rpn(child))
+    tokens.append('({}:_)'.format(_TYPES[tree.__class__]))
+    return tokens
+
+
+def size(tree):
+    """Number of nodes of the expanded tree, shared subtrees counted
+    every time they occur.
+    """
+    sizes = {}
+
+    def visit(node):
+        if node not in sizes:
+            sizes[node] = 1 + sum(visit(child) for child in node.children())
+        return sizes[node]
+
+    return visit(tree)
+
+
+def depth(tree):
+    """Length of the longest path from the root to a leaf"""
+    depths = {}
+
+    def visit(node):
+        if node not in depths:
+            depths[node] = 1 + max([visit(child) for child in node.children()] or [0])
+        return depths[node]
+
+    return visit(tree)
+
+
+def ops_per_second(func):
+    """Calls func repeatedly for at least DURATION seconds.
+
+    :return: Calls per second
+    :rtype: float
+    """
+    calls = 0
+    batch = 1
+    start = time.perf_counter()
+    while True:
+        for _ in range(batch):
+            func()
+        calls += batch
+        elapsed = time.perf_counter() - start
+        if elapsed >= DURATION:
+            return calls / elapsed
+        batch *= 2
+
+
+def peak_allocation(func):
+    """Peak memory allocated by func in bytes"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _evaluate_all(evaluate):
+    for value in VALUES:
+        evaluate(value)
+
+
+def measure(text):
+    """Runs all benchmarks for one expression.
+
+    :param text: Expression in infix-notation
+    :type text: str
+    :return: Metrics by name
+    :rtype: dict
+    """
+    tree = infix.parse(text)
+    tokens = to_rpn(tree)
+    expr = Expression(root=tree)
+    compiled = expr.compile()
+    raw = tree.diff()
+
+    results = {
+        'parse_rpn_ops': ops_per_second(lambda: _parse(tokens)),
+        'parse_infix_ops': ops_per_second(lambda: infix.parse(text)),
+        'evaluate_ops': ops_per_second(lambda: _evaluate_all(tree.evaluate)) * len(VALUES),
+        'compiled_ops': ops_per_second(lambda: _evaluate_all(compiled)) * len(VALUES),
+        'evaluate_many_ops': ops_per_second(lambda: expr.evaluate_many(VALUES)) * len(VALUES),
+        'diff_ops': ops_per_second(tree.diff),
+        'simplify_ops': ops_per_second(lambda: simplifier.simplify(raw)),
+        'nodes': size(tree),
+        'derivative_nodes': size(raw),
+        'simplified_nodes': size(simplifier.simplify(raw)),
+    }
+
+    derivative = tree
+    for order in range(1, ORDER + 1):
+        derivative = simplifier.simplify(derivative.diff())
+        results['derivative_{}_depth'.format(order)] = depth(derivative)
+        results['derivative_{}_nodes'.format(order)] = size(derivative)
+
+    # measured last and without interned nodes, every node is allocated
+    reset_caches()
+    results['peak_bytes'] = peak_allocation(
+        lambda: simplifier.simplify(_parse(tokens).diff()))
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run():
+    """Benchmarks the whole corpus.
+
+    :return: Results with the commit and Python version
+    :rtype: dict
+    """
+    return {
+        'commit': _commit(),
+        'python': platform.python_implementation() + ' ' + platform.python_version(),
+        'expressions': dict((name, measure(text)) for name, text in CORPUS),
+    }
+
+
+def compare(results, baseline):
+    """Prints the change of every metric relative to a baseline"""
+    print('Compared with {}'.format(baseline.get('commit')))
+    for name, metrics in results['expressions'].items():
+        old = baseline['expressions'].get(name)
+        if old is None:
+            continue
+        print(name)
+        for metric, value in metrics.items():
+            if not old.get(metric):
+                continue
+            print('  {:<22} {:>14.6g} {:>+8.1%}'.format(
+                metric, value, value / old[metric] - 1))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', help='write the results as JSON')
+    parser.add_argument('--compare', help='JSON results to compare with')
+    args = parser.parse_args(argv)
+
+    results = run()
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+    else:
+        for name, metrics in results['expressions'].items():
+            print(name)
+            for metric, value in metrics.items():
+                print('  {:<22} {:>14.6g}'.format(metric, value))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
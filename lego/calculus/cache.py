@@ -0,0 +1,78 @@
+"""
+Bounded caches, so expressions drawn again and again are parsed,
+differentiated and planned only once while the memory stays capped.
+"""
+
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ucollections import OrderedDict
+
+# entries of the expression cache
+CAPACITY = 8
+# entries of the derivative cache, one per differentiated tree
+DERIVATIVE_CAPACITY = 32
+# interned nodes, beyond that the intern table is cleared with the caches
+# between two jobs, see expression.limit_caches
+NODE_CAPACITY = 1024
+
+
+class LRUCache:
+    """Mapping holding at most capacity entries, evicting the least
+    recently used one. Only uses insertion order, which MicroPython's
+    OrderedDict provides as well.
+
+    :param capacity: Maximum number of entries
+    :type capacity: int
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Returns the value of key and marks it as recently used."""
+        if key not in self._entries:
+            return default
+        # reinsert to move it to the end
+        value = self._entries.pop(key)
+        self._entries[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._entries:
+            self._entries.pop(key)
+        elif len(self._entries) >= self.capacity:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = value
+
+    def clear(self):
+        self._entries.clear()
+
+
+def canonical(tokens):
+    """Creates the cache key of the input of an Expression.
+
+    :param tokens: Tokens in RPN-Notation, body of a binary frame or
+    infix-notation
+    :type tokens: Iterable[str] | bytes | str
+    :return: Tuple of the tokens, the body or the infix string without
+    whitespace
+    :rtype: tuple | bytes | str
+    """
+    if isinstance(tokens, str):
+        return ''.join(tokens.split())
+    if isinstance(tokens, (bytes, bytearray, memoryview)):
+        return bytes(tokens)
+    return tuple(tokens)
+
+
+# entries per canonical input, a dict holding the parsed 'tree' and
+# whatever users precompute for it, e.g. the start point and plan
+expressions = LRUCache(CAPACITY)
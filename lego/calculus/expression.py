@@ -1,130 +1,163 @@
 """
 Representation of a expression
-Parses given tokens using an recursive descent parser respecting a grammar:
+Parses tokens in RPN-Notation, the binary wire format or infix-notation.
+Infix-notation is parsed by a recursive descent parser (calculus.infix)
+respecting a grammar:
 
 expression = factor {'+' | '-' factor};
-factor = power {'*' | '/' power};
-power = unary {'^' unary};
-unary = ('-' | '+' | ) term;
+factor = unary {'*' | '/' unary};
+unary = ('-' | '+') unary | power;
+power = term ['^' unary];
 term = '(' expression ')' | number | function | variable | constant;
 number = {digit}['.' {digit}];
-function = function_name '(' term ')';
+function = function_name '(' expression [',' expression] ')';
 digit = 0|..|9;
 variable = 'a'|..|'z';
 constant = 'e' | 'pi' | 'tau';
 """
 
 
+from . import cache, infix, interval, simplifier
+from . import tokens as tokens_
+from . import vector, wire
 from .exception import ParsingError
-from .nodes import (Acos, Add, Asin, Atan, Constant, Cos, Divide, Ln, Log,
-                    Multiply, Negate, Number, Pow, Root, Sin, Sqrt, Subtract,
-                    Tan, Variable)
-
-class _Token:
-    """Representing a token
-    """
-    def __init__(self, type_, value) -> None:
-        self.type_ = type_
-        self.value = value
-
-
-def _tokenize(token: str):
-    """Converts a token string to a token"""
-    type_, value = token.strip('()').split(':')
-    return _Token(type_, value)
-
+from .nodes import Variable
+from .nodes.node import Node
 
 def _parse(tokens):
     """Parses a sequence of tokens in RPN-Notation
-    using a stack-based algorithm.
+    using a stack-based algorithm. Tokens are consumed one by one
+    from the iterable and dispatched by their type.
 
-    :param tokens: Sequence of tokens in RPN-Notation
-    :type tokens: List[Token]
-    :raises ParsingError: Input String was not correct
+    :param tokens: Tokens in RPN-Notation, e.g. '(VAL:0.1)'
+    :type tokens: Iterable[str]
+    :raises ParsingError: Input String was not correct, with the position
+    of the offending token
     :return: Root Node of Expression Tree
     :rtype: Node
     """
     expr_stack = []
-    input_stream = [_tokenize(token) for token in tokens]
-
-    for token in input_stream:
-        if token.type_ == 'VAL':
-            if token.value == 2.718281828459045:
-                curr_expr = Constant('e')
+    operations = tokens_.OPERATIONS
+
+    position = -1
+    for position, token in enumerate(tokens):
+        try:
+            type_, value = token.strip('()').split(':')
+        except ValueError:
+            raise ParsingError('Malformed token {} at position {}'.format(token, position))
+
+        operation = operations.get(type_)
+        if operation is not None:
+            node, arity = operation
+            if len(expr_stack) < arity:
+                raise ParsingError('Missing argument for {} at position {}'.format(type_, position))
+            if arity == 1:
+                expr_stack.append(node(expr_stack.pop()))
             else:
-                curr_expr = Number(float(token.value))
-
-        if token.type_ == 'VAR':
-            curr_expr = Variable()
-
-        if token.type_ == 'UNMINUS':
-            curr_expr = Negate(expr_stack.pop())
-
-        if token.type_ == 'PLUS':
-            right = expr_stack.pop()
-            left = expr_stack.pop()
-            curr_expr = Add(left, right)
-
-        if token.type_ == 'MINUS':
-            right = expr_stack.pop()
-            left = expr_stack.pop()
-            curr_expr = Subtract(left, right)
-
-        if token.type_ == 'TIMES':
-            right = expr_stack.pop()
-            left = expr_stack.pop()
-            curr_expr = Multiply(left, right)
-
-        if token.type_ == 'DIV':
-            right = expr_stack.pop()
-            left = expr_stack.pop()
-            curr_expr = Divide(left, right)
-
-        if token.type_ == 'POW':
-            right = expr_stack.pop()
-            left = expr_stack.pop()
-            curr_expr = Pow(left, right)
-
-        if token.type_ == 'LOG':
-            right = expr_stack.pop()
-            left = expr_stack.pop()
-            curr_expr = Log(left, right)
+                right = expr_stack.pop()
+                expr_stack.append(node(expr_stack.pop(), right))
+        elif type_ == 'VAL':
+            try:
+                expr_stack.append(tokens_.number(float(value)))
+            except ValueError:
+                raise ParsingError('Invalid number {} at position {}'.format(value, position))
+        elif type_ == 'VAR':
+            expr_stack.append(Variable())
+        else:
+            raise ParsingError('Unknown token {} at position {}'.format(token, position))
 
-        if token.type_ == 'LN':
-            curr_expr = Ln(expr_stack.pop())
+    if len(expr_stack) != 1:
+        raise ParsingError('The input String is not a correct expression, '
+                           '{} operands left after position {}'.format(len(expr_stack), position))
 
-        if token.type_ == 'SQRT':
-            curr_expr = Sqrt(expr_stack.pop())
+    return expr_stack[0]
 
-        if token.type_ == 'ROOT':
-            right = expr_stack.pop()
-            left = expr_stack.pop()
-            curr_expr = Root(left, right)
 
-        if token.type_ == 'SIN':
-            curr_expr = Sin(expr_stack.pop())
+def _parse_input(key):
+    """Parses the canonical input of an Expression.
 
-        if token.type_ == 'ASIN':
-            curr_expr = Asin(expr_stack.pop())
+    :param key: Key returned by cache.canonical
+    :type key: tuple | bytes | str
+    :return: Root Node of Expression Tree
+    :rtype: Node
+    """
+    if isinstance(key, str):
+        return infix.parse(key)
+    if isinstance(key, bytes):
+        return wire.decode(key)
+    return _parse(key)
+
+
+def reset_caches():
+    """Empties the intern table of the nodes together with the caches
+    holding trees built from it, so the next parse builds every node
+    again. Trees built before aren't simplified together with new ones
+    anymore.
+    """
+    Node.clear()
+    cache.expressions.clear()
+    Expression._derivatives.clear()
 
-        if token.type_ == 'TAN':
-            curr_expr = Tan(expr_stack.pop())
 
-        if token.type_ == 'ATAN':
-            curr_expr = Atan(expr_stack.pop())
+def limit_caches():
+    """Resets the caches once the intern table holds more than
+    cache.NODE_CAPACITY nodes. Old and new nodes aren't identical
+    anymore, so the simplifier wouldn't combine them. Only call it while
+    no tree is in use, e.g. between two jobs, not between parsing an
+    expression and building its derivatives.
+    """
+    if len(Node._instances) > cache.NODE_CAPACITY:
+        reset_caches()
 
-        if token.type_ == 'COS':
-            curr_expr = Cos(expr_stack.pop())
 
-        if token.type_ == 'ACOS':
-            curr_expr = Acos(expr_stack.pop())
+def _count_references(tree):
+    """Counts how many parents refer to each node of the tree.
+    Identical subtrees are the same object, so a count above one
+    marks a common subexpression.
 
-        expr_stack.append(curr_expr)
+    :param tree: Root Node
+    :type tree: Node
+    :return: Number of references per node
+    :rtype: dict[Node, int]
+    """
+    counts = {tree: 1}
+    stack = [tree]
+    while stack:
+        for child in stack.pop().children():
+            if child in counts:
+                counts[child] += 1
+            else:
+                counts[child] = 1
+                stack.append(child)
+    return counts
+
+
+def _shared(func, slots):
+    """Wraps a compiled closure of a common subexpression so it is only
+    evaluated once per value of x. The last argument and result are kept
+    in a pair of registers of the slot table.
+
+    :param func: Compiled closure
+    :type func: Callable[[float], float]
+    :param slots: Slot table shared by the compiled Expression
+    :type slots: list
+    :return: Closure evaluating func at most once per value of x
+    :rtype: Callable[[float], float]
+    """
+    index = len(slots)
+    slots.append(None)
+    slots.append(None)
 
-    if len(expr_stack) > 1:
-        raise ParsingError('The input String is not a correct expression')
+    def shared(x):
+        # the same x object is passed down the whole closure chain
+        if slots[index] is x:
+            return slots[index + 1]
+        value = func(x)
+        slots[index] = x
+        slots[index + 1] = value
+        return value
 
-    return expr_stack[-1]
+    return shared
 
 
 class Expression:
@@ -143,9 +176,21 @@ class Expression:
                    / \
                   x   3
     """
+
+    # simplified derivative of the recently differentiated trees
+    _derivatives = cache.LRUCache(cache.DERIVATIVE_CAPACITY)
+
     def __init__(self, tokens=None, root=None):
+        # entry of the expression cache, None if created from a tree
+        self.cached = None
         if tokens:
-            self.tree = _parse(tokens)
+            key = cache.canonical(tokens)
+            entry = cache.expressions.get(key)
+            if entry is None:
+                entry = {'tree': _parse_input(key)}
+                cache.expressions[key] = entry
+            self.cached = entry
+            self.tree = entry['tree']
         else:
             self.tree = root
 
@@ -159,6 +204,97 @@ class Expression:
         """
         return self.tree.evaluate(value)
 
+    def evaluate_many(self, values):
+        """Evaluates the Expression for many values of x in one tree walk.
+        Uses NumPy ufuncs if NumPy is installed, otherwise array.array.
+        Values outside of the domain result in nan (or inf at poles).
+
+        :param values: Values for x
+        :type values: numpy.ndarray | array.array | Iterable[float]
+        :return: Results of evaluation, one per value
+        :rtype: numpy.ndarray | array.array
+        """
+        lib = vector.get_lib()
+        values = lib.asarray(values, dtype=float)
+
+        if lib is vector.numpy:
+            with lib.errstate(all='ignore'):
+                result = self.tree.evaluate_many(values, lib)
+        else:
+            result = self.tree.evaluate_many(values, lib)
+
+        if not isinstance(result, type(values)):
+            # expression independent of x
+            return lib.full(len(values), result)
+        return result
+
+    def evaluate_interval(self, lower, upper):
+        """Evaluates guaranteed bounds of the Expression for all values
+        of x within [lower, upper] using interval arithmetic.
+
+        :param lower: Lower bound of x
+        :type lower: float
+        :param upper: Upper bound of x
+        :type upper: float
+        :raises EvaluationError: Not defined anywhere in the interval
+        :return: Bounds (lower, upper) of the results
+        :rtype: tuple[float, float]
+        """
+        return self.tree.evaluate_interval((lower, upper))
+
+    def visible_ranges(self, lower, upper, y_lower, y_upper, resolution):
+        """Finds all sub-intervals of [lower, upper] in which the curve
+        can be within [y_lower, y_upper], by bisecting with
+        evaluate_interval. Skips invisible stretches without evaluating
+        every point.
+
+        :param lower: Lower bound of x
+        :type lower: float
+        :param upper: Upper bound of x
+        :type upper: float
+        :param y_lower: Lower bound of y
+        :type y_lower: float
+        :param y_upper: Upper bound of y
+        :type y_upper: float
+        :param resolution: Width below which intervals are not split anymore
+        :type resolution: float
+        :return: Sorted, disjoint intervals of x
+        :rtype: list[tuple[float, float]]
+        """
+        return interval.visible_ranges(
+            self.tree, lower, upper, y_lower, y_upper, resolution)
+
+    def compile(self, eliminate_common=True):
+        """Compiles the Expression into a single closure chain.
+        Subtrees not depending on x are folded into constants, so
+        evaluating a point costs one call instead of a walk through
+        every node. Use it for repeated evaluation, e.g. while drawing.
+
+        :param eliminate_common: Evaluate subtrees occurring more than
+        once only once per value of x, defaults to True
+        :type eliminate_common: bool, optional
+        :return: Function evaluating the Expression for a value of x
+        :rtype: Callable[[float], float]
+        """
+        counts = _count_references(self.tree) if eliminate_common else {}
+        compiled = {}
+        slots = []
+
+        def compiler(node):
+            if node in compiled:
+                return compiled[node]
+            func = node.compile(compiler)
+            if callable(func) and counts.get(node, 0) > 1 and node.children():
+                func = _shared(func, slots)
+            compiled[node] = func
+            return func
+
+        func = compiler(self.tree)
+        if not callable(func):
+            value = func
+            return lambda _: value
+        return func
+
     def to_infix(self):
         """Converts the expression to infix-notation
         using a visitor pattern.
@@ -178,27 +314,41 @@ class Expression:
         :return: First derivative
         :rtype: Expression
         """
-        tree = Expression(root=self.tree.diff())
         if simplify:
-            tree.simplify()
-        return tree
+            return self.derivative(1)
+        return Expression(root=self.tree.diff())
+
+    def derivative(self, n=1):
+        """Returns the simplified n-th derivative of the Expression,
+        respects to x. Derivatives are cached by tree, as identical trees
+        are the same object, repeated requests only cost a lookup.
+        The cache holds the cache.DERIVATIVE_CAPACITY most recent trees.
+        Higher derivatives are built from the simplified lower ones.
+
+        :param n: Order of the derivative, defaults to 1
+        :type n: int, optional
+        :return: n-th derivative
+        :rtype: Expression
+        """
+        tree = self.tree
+        for _ in range(n):
+            derivative = Expression._derivatives.get(tree)
+            if derivative is None:
+                derivative = simplifier.simplify(tree.diff())
+                Expression._derivatives[tree] = derivative
+            tree = derivative
+        return Expression(root=tree)
 
     def simplify(self):
-        """Simplifies the tree in-place.
-        Current Rules:
-            - Calculate Explicit Numbers
-            - x + 0 -> x
-            - x - 0 -> x
-            - 0 - x -> -x
-            - x * 0 -> 0
-            - x * 1 -> x
-            - x / 1 -> x
-            - x ^ 0 -> 1
-            - x ^ 1 -> x
-            - x * (y / z) -> (x * y) / z
+        """Simplifies the tree in-place, applying the rules of
+        calculus.simplifier until none applies anymore.
 
         :return: self, for chaining
         :rtype: Expression
         """
-        self.tree = self.tree.simplify()
+        self.tree = simplifier.simplify(self.tree)
         return self
+
+
+# constants and patterns created on import stay interned
+Node.keep()
@@ -0,0 +1,201 @@
+"""
+Parser for expressions in infix-notation, e.g. '3*x^2 - ln(4)'.
+Builds the same trees as the RPN tokens of the app, following the grammar
+in calculus.expression. Powers are right associative and bind
+stronger than a sign: -x^2 is -(x^2).
+"""
+
+import math
+
+from .exception import ParsingError, TokenizingError
+from .nodes import (Acos, Asin, Atan, Constant, Cos, Ln, Log, Number, Root,
+                    Sin, Sqrt, Tan, Variable)
+from .tokens import OPERATIONS
+
+NUMBER = 'number'
+NAME = 'name'
+END = 'end'
+
+_SYMBOLS = '+-*/^(),'
+_DIGITS = '0123456789.'
+
+# functions of one argument
+FUNCTIONS = {
+    'sin': Sin,
+    'cos': Cos,
+    'tan': Tan,
+    'arcsin': Asin,
+    'asin': Asin,
+    'arccos': Acos,
+    'acos': Acos,
+    'arctan': Atan,
+    'atan': Atan,
+    'ln': Ln,
+    'sqrt': Sqrt,
+}
+
+# functions of two arguments, log(base, x) and nrt(degree, x)
+BINARY_FUNCTIONS = {
+    'log': Log,
+    'nrt': Root,
+}
+
+CONSTANTS = {
+    'e': Constant('e'),
+    'pi': Constant('pi'),
+    'tau': Number(2 * math.pi),
+}
+
+# node of each binary operator
+_OPERATORS = {
+    '+': OPERATIONS['PLUS'][0],
+    '-': OPERATIONS['MINUS'][0],
+    '*': OPERATIONS['TIMES'][0],
+    '/': OPERATIONS['DIV'][0],
+    '^': OPERATIONS['POW'][0],
+}
+
+
+def tokenize(text):
+    """Splits infix-notation into tokens.
+
+    :param text: Expression in infix-notation
+    :type text: str
+    :raises TokenizingError: Unknown character, with its position
+    :return: Tokens (kind, value, position), kind is NUMBER, NAME, END or
+    the symbol itself
+    :rtype: list[tuple[str, str | float | None, int]]
+    """
+    tokens = []
+    index = 0
+    length = len(text)
+    while index < length:
+        char = text[index]
+        if char in ' \t\n':
+            index += 1
+        elif char in _SYMBOLS:
+            tokens.append((char, None, index))
+            index += 1
+        elif char in _DIGITS:
+            start = index
+            while index < length and text[index] in _DIGITS:
+                index += 1
+            try:
+                tokens.append((NUMBER, float(text[start:index]), start))
+            except ValueError:
+                raise TokenizingError('Invalid number {} at position {}'.format(
+                    text[start:index], start))
+        elif char.isalpha():
+            start = index
+            while index < length and text[index].isalpha():
+                index += 1
+            tokens.append((NAME, text[start:index], start))
+        else:
+            raise TokenizingError('Unknown character {} at position {}'.format(char, index))
+    tokens.append((END, None, length))
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser over the tokens of tokenize"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.index = 0
+
+    def peek(self):
+        return self.tokens[self.index][0]
+
+    def next(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, kind):
+        token = self.next()
+        if token[0] != kind:
+            raise ParsingError('Expected {} at position {}'.format(kind, token[2]))
+        return token
+
+    def expression(self):
+        """expression = factor {'+' | '-' factor}"""
+        left = self.factor()
+        while self.peek() in '+-':
+            operator = self.next()[0]
+            left = _OPERATORS[operator](left, self.factor())
+        return left
+
+    def factor(self):
+        """factor = unary {'*' | '/' unary}"""
+        left = self.unary()
+        while self.peek() in '*/':
+            operator = self.next()[0]
+            left = _OPERATORS[operator](left, self.unary())
+        return left
+
+    def unary(self):
+        """unary = ('-' | '+') unary | power"""
+        if self.peek() == '-':
+            self.next()
+            return OPERATIONS['UNMINUS'][0](self.unary())
+        if self.peek() == '+':
+            self.next()
+            return self.unary()
+        return self.power()
+
+    def power(self):
+        """power = term ['^' unary]"""
+        base = self.term()
+        if self.peek() == '^':
+            self.next()
+            return _OPERATORS['^'](base, self.unary())
+        return base
+
+    def term(self):
+        """term = '(' expression ')' | number | function | variable | constant"""
+        kind, value, position = self.next()
+        if kind == '(':
+            node = self.expression()
+            self.expect(')')
+            return node
+        if kind == NUMBER:
+            return Number(value)
+        if kind != NAME:
+            raise ParsingError('Unexpected {} at position {}'.format(
+                'end' if kind == END else kind, position))
+
+        if value in FUNCTIONS:
+            self.expect('(')
+            arg = self.expression()
+            self.expect(')')
+            return FUNCTIONS[value](arg)
+        if value in BINARY_FUNCTIONS:
+            self.expect('(')
+            left = self.expression()
+            self.expect(',')
+            right = self.expression()
+            self.expect(')')
+            return BINARY_FUNCTIONS[value](left, right)
+        if value in CONSTANTS:
+            return CONSTANTS[value]
+        if len(value) == 1:
+            return Variable()
+        raise ParsingError('Unknown name {} at position {}'.format(value, position))
+
+
+def parse(text):
+    """Parses an expression in infix-notation.
+
+    :param text: Expression, e.g. '3*x^2 - ln(4)'
+    :type text: str
+    :raises TokenizingError: Unknown character
+    :raises ParsingError: Input String was not correct, with the position
+    :return: Root Node of Expression Tree
+    :rtype: Node
+    """
+    parser = _Parser(tokenize(text))
+    tree = parser.expression()
+    kind, _, position = parser.next()
+    if kind != END:
+        raise ParsingError('Unexpected {} at position {}'.format(kind, position))
+    return tree
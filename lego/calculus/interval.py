@@ -0,0 +1,221 @@
+"""
+Interval arithmetic used by Node.evaluate_interval.
+An interval is a tuple (lower, upper) of floats, the bounds may be
+infinite. All functions return bounds guaranteed to contain every value
+the operation can take for arguments within the given intervals.
+Arguments partly outside of the domain are clamped to it, arguments
+completely outside raise EvaluationError.
+"""
+
+import math
+
+from .exception import EvaluationError
+
+INF = float('inf')
+TAU = 2 * math.pi
+
+# set by clamp, if an interval was partly outside of a domain
+_clamped = [False]
+
+
+def _product(left, right):
+    """Product of two bounds, where 0 * inf is 0."""
+    if left == 0 or right == 0:
+        return 0.0
+    return left * right
+
+
+def _safe(func, value, overflow):
+    """Applies func, returning overflow if the result is too large."""
+    try:
+        return func(value)
+    except OverflowError:
+        return overflow
+
+
+def multiply(left, right):
+    """Product of two intervals."""
+    products = (
+        _product(left[0], right[0]), _product(left[0], right[1]),
+        _product(left[1], right[0]), _product(left[1], right[1])
+    )
+    return min(products), max(products)
+
+
+def divide(left, right):
+    """Quotient of two intervals. Contains the whole real line if
+    the divisor contains zero.
+    """
+    lower, upper = right
+    if lower == upper == 0:
+        raise EvaluationError('Division by zero')
+    if lower <= 0 <= upper:
+        return -INF, INF
+    return multiply(left, (1 / upper, 1 / lower))
+
+
+def monotone(func, arg, increasing=True):
+    """Applies a monotone function to an interval."""
+    lower, upper = func(arg[0]), func(arg[1])
+    if increasing:
+        return lower, upper
+    return upper, lower
+
+
+def clamp(arg, lower, upper):
+    """Clamps an interval to a domain.
+
+    :raises EvaluationError: Interval is outside of the domain
+    """
+    if arg[1] < lower or arg[0] > upper:
+        raise EvaluationError('Not defined for {}'.format(arg))
+    if arg[0] < lower or arg[1] > upper:
+        _clamped[0] = True
+    return max(arg[0], lower), min(arg[1], upper)
+
+
+def exp(arg):
+    """Exponential function of an interval."""
+    return _safe(math.exp, arg[0], INF), _safe(math.exp, arg[1], INF)
+
+
+def log(arg):
+    """Natural logarithm of an interval."""
+    lower, upper = clamp(arg, 0, INF)
+    if upper == 0:
+        raise EvaluationError('Not defined for {}'.format(arg))
+    return (math.log(lower) if lower > 0 else -INF), math.log(upper)
+
+
+def sqrt(arg):
+    """Square root of an interval."""
+    return monotone(math.sqrt, clamp(arg, 0, INF))
+
+
+def _integer_power(base, exponent):
+    """Power of an interval with a whole exponent."""
+    if exponent == 0:
+        return 1.0, 1.0
+    if exponent < 0:
+        return divide((1.0, 1.0), _integer_power(base, -exponent))
+
+    def power(value):
+        overflow = math.copysign(INF, value) if exponent % 2 else INF
+        return _safe(lambda v: v ** exponent, value, overflow)
+
+    lower, upper = base
+    if exponent % 2 or lower >= 0:
+        return power(lower), power(upper)
+    if upper <= 0:
+        return power(upper), power(lower)
+    return 0.0, max(power(lower), power(upper))
+
+
+def power(base, exponent):
+    """Power of two intervals. For exponents other than a whole number
+    the base is clamped to positive values.
+    """
+    if exponent[0] == exponent[1] and abs(exponent[0]) != INF:
+        value = exponent[0]
+        if value == int(value):
+            return _integer_power(base, int(value))
+
+        lower, upper = clamp(base, 0, INF)
+        if value < 0 and lower == 0:
+            if upper == 0:
+                raise EvaluationError('Division by zero')
+            return upper ** value, INF
+        results = (_safe(lambda v: v ** value, lower, INF),
+                   _safe(lambda v: v ** value, upper, INF))
+        return min(results), max(results)
+
+    # x ^ y = e ^ (y * ln(x))
+    return exp(multiply(exponent, log(base)))
+
+
+def sin(arg):
+    """Sine of an interval."""
+    lower, upper = arg
+    if not upper - lower < TAU:
+        return -1.0, 1.0
+
+    # shift to [0, tau) to find the contained extrema
+    shift = math.floor(lower / TAU) * TAU
+    lower, upper = lower - shift, upper - shift
+
+    values = (math.sin(lower), math.sin(upper))
+    result_lower, result_upper = min(values), max(values)
+    # maxima at tau/4 + k*tau, minima at 3tau/4 + k*tau
+    if lower <= TAU / 4 <= upper or lower <= 5 * TAU / 4 <= upper:
+        result_upper = 1.0
+    if lower <= 3 * TAU / 4 <= upper or lower <= 7 * TAU / 4 <= upper:
+        result_lower = -1.0
+    return result_lower, result_upper
+
+
+def cos(arg):
+    """Cosine of an interval."""
+    return sin((arg[0] + TAU / 4, arg[1] + TAU / 4))
+
+
+def tan(arg):
+    """Tangent of an interval. Contains the whole real line if
+    the interval contains a pole.
+    """
+    lower, upper = arg
+    if not upper - lower < math.pi:
+        return -INF, INF
+    # poles at pi/2 + k*pi
+    pole = math.ceil((lower - math.pi / 2) / math.pi) * math.pi + math.pi / 2
+    if pole <= upper:
+        return -INF, INF
+    return math.tan(lower), math.tan(upper)
+
+
+def visible_ranges(tree, lower, upper, y_lower, y_upper, resolution):
+    """Finds all sub-intervals of [lower, upper] in which the function
+    can lie within [y_lower, y_upper], using bisection.
+    Intervals are split until their bounds are either completely inside
+    or outside of the y-range, or their width falls below resolution.
+    Intervals where the function is only partly defined are split, too.
+
+    :param tree: Root Node of the function
+    :type tree: Node
+    :param lower: Lower bound of x
+    :type lower: float
+    :param upper: Upper bound of x
+    :type upper: float
+    :param y_lower: Lower bound of y
+    :type y_lower: float
+    :param y_upper: Upper bound of y
+    :type y_upper: float
+    :param resolution: Minimum width of an interval
+    :type resolution: float
+    :return: Sorted, disjoint intervals of x, where the curve can be visible
+    :rtype: list[tuple[float, float]]
+    """
+    ranges = []
+    stack = [(lower, upper)]
+    while stack:
+        x_lower, x_upper = stack.pop()
+        _clamped[0] = False
+        try:
+            y_min, y_max = tree.evaluate_interval((x_lower, x_upper))
+        except EvaluationError:
+            continue
+
+        if y_max < y_lower or y_min > y_upper:
+            continue
+
+        inside = y_lower <= y_min and y_max <= y_upper and not _clamped[0]
+        if inside or x_upper - x_lower <= resolution:
+            if ranges and ranges[-1][1] == x_lower:
+                ranges[-1] = (ranges[-1][0], x_upper)
+            else:
+                ranges.append((x_lower, x_upper))
+            continue
+
+        middle = (x_lower + x_upper) / 2
+        stack.append((middle, x_upper))
+        stack.append((x_lower, middle))
+    return ranges
@@ -3,21 +3,30 @@ import math
 
 from calculus.nodes import negate
 
+from .. import interval
 from . import divide, multiply, node, number, power, sqrt, subtract
 
 
 class Acos(node.Node):
     """Acos node"""
 
-    def __init__(self, arg):
-        self.arg = arg
-
-    def copy(self):
-        return Acos(self.arg.copy())
+    __slots__ = ('arg',)
+    _fields = ('arg',)
 
     def evaluate(self, value):
         return math.acos(self.arg.evaluate(value))
 
+    def evaluate_many(self, values, lib):
+        return lib.arccos(self.arg.evaluate_many(values, lib))
+
+    def evaluate_interval(self, arg):
+        return interval.monotone(
+            math.acos, interval.clamp(self.arg.evaluate_interval(arg), -1, 1),
+            increasing=False)
+
+    def compile(self, compiler):
+        return self.compile_call(compiler, math.acos, self.arg)
+
     def diff(self):
         return multiply.Multiply(
             self.arg.diff(),
@@ -34,9 +43,5 @@ class Acos(node.Node):
             )
         )
 
-    def simplify(self):
-        self.arg = self.arg.simplify()
-        return super().simplify()
-
     def to_infix(self):
         return 'arccos({})'.format(self.arg.to_infix())
@@ -2,21 +2,29 @@
 
 import math
 
+from .. import interval
 from . import divide, multiply, node, number, power, sqrt, subtract
 
 
 class Asin(node.Node):
     """Arcsin node"""
 
-    def __init__(self, arg):
-        self.arg = arg
-
-    def copy(self):
-        return Asin(self.arg.copy())
+    __slots__ = ('arg',)
+    _fields = ('arg',)
 
     def evaluate(self, value):
         return math.asin(self.arg.evaluate(value))
 
+    def evaluate_many(self, values, lib):
+        return lib.arcsin(self.arg.evaluate_many(values, lib))
+
+    def evaluate_interval(self, arg):
+        return interval.monotone(
+            math.asin, interval.clamp(self.arg.evaluate_interval(arg), -1, 1))
+
+    def compile(self, compiler):
+        return self.compile_call(compiler, math.asin, self.arg)
+
     def diff(self):
         return multiply.Multiply(
             self.arg.diff(),
@@ -31,9 +39,5 @@ class Asin(node.Node):
             )
         )
 
-    def simplify(self):
-        self.arg = self.arg.simplify()
-        return super().simplify()
-
     def to_infix(self):
         return 'arcsin({})'.format(self.arg.to_infix())
@@ -2,21 +2,28 @@
 
 import math
 
+from .. import interval
 from . import add, divide, multiply, node, number, power
 
 
 class Atan(node.Node):
     """Arctan node"""
 
-    def __init__(self, arg):
-        self.arg = arg
-
-    def copy(self):
-        return Atan(self.arg.copy())
+    __slots__ = ('arg',)
+    _fields = ('arg',)
 
     def evaluate(self, value):
         return math.atan(self.arg.evaluate(value))
 
+    def evaluate_many(self, values, lib):
+        return lib.arctan(self.arg.evaluate_many(values, lib))
+
+    def evaluate_interval(self, arg):
+        return interval.monotone(math.atan, self.arg.evaluate_interval(arg))
+
+    def compile(self, compiler):
+        return self.compile_call(compiler, math.atan, self.arg)
+
     def diff(self):
         return multiply.Multiply(
             self.arg.diff(),
@@ -29,9 +36,5 @@ class Atan(node.Node):
             )
         )
 
-    def simplify(self):
-        self.arg = self.arg.simplify()
-        return super().simplify()
-
     def to_infix(self):
         return 'arctan({})'.format(self.arg.to_infix())
@@ -9,21 +9,8 @@ from . import node, number
 class Constant(node.Node):
     """Constant node. Multiton. Looks up the math module"""
 
-    _instances = dict()
-
-    def __new__(cls, name):
-        if name in cls._instances:
-            return cls._instances[name]
-
-        obj = super(Constant, cls).__new__(cls)
-        cls._instances[name] = obj
-        return obj
-
-    def __init__(self, name):
-        self.name = name
-
-    def copy(self):
-        return Constant(self.name)
+    __slots__ = ('name',)
+    _fields = ('name',)
 
     def evaluate(self, _):
         if self.name == 'e':
@@ -33,6 +20,16 @@ class Constant(node.Node):
         else:
             raise UnknownConstant('Constant {} is unknown'.format(self.name))
 
+    def evaluate_many(self, values, lib):
+        return self.evaluate(None)
+
+    def evaluate_interval(self, arg):
+        value = self.evaluate(None)
+        return value, value
+
+    def compile(self, compiler):
+        return self.evaluate(None)
+
     def diff(self):
         return number.Number(0)
 
@@ -2,31 +2,30 @@
 
 import math
 
-from . import multiply, negate, node, number, sin
+from .. import interval
+from . import multiply, negate, node, sin
 
 
 class Cos(node.Node):
     """Cos node"""
 
-    def __init__(self, arg):
-        self.arg = arg
-
-    def copy(self):
-        return Cos(self.arg.copy())
+    __slots__ = ('arg',)
+    _fields = ('arg',)
 
     def evaluate(self, value):
         return math.cos(self.arg.evaluate(value))
 
-    def diff(self):
-        return multiply.Multiply(self.arg.diff(), negate.Negate(sin.Sin(self.arg)))
+    def evaluate_many(self, values, lib):
+        return lib.cos(self.arg.evaluate_many(values, lib))
 
-    def simplify(self):
-        self.arg = self.arg.simplify()
+    def evaluate_interval(self, arg):
+        return interval.cos(self.arg.evaluate_interval(arg))
 
-        if self.arg is number.Number(0):
-            return number.Number(1)
+    def compile(self, compiler):
+        return self.compile_call(compiler, math.cos, self.arg)
 
-        return super().simplify()
+    def diff(self):
+        return multiply.Multiply(self.arg.diff(), negate.Negate(sin.Sin(self.arg)))
 
     def to_infix(self):
         return 'cos({})'.format(self.arg.to_infix())
@@ -1,43 +1,49 @@
 """Division node"""
 
+from .. import interval
 from . import multiply, node, number, power, subtract
 
 
 class Divide(node.Node):
     """Division node"""
 
-    def __init__(self, left=None, right=None):
-        self.left = left
-        self.right = right
-
-    def copy(self):
-        return Divide(self.left.copy(), self.right.copy())
+    __slots__ = ('left', 'right')
+    _fields = ('left', 'right')
 
     def evaluate(self, value):
         return self.left.evaluate(value) / self.right.evaluate(value)
 
+    def evaluate_many(self, values, lib):
+        return lib.divide(
+            self.left.evaluate_many(values, lib),
+            self.right.evaluate_many(values, lib)
+        )
+
+    def evaluate_interval(self, arg):
+        return interval.divide(
+            self.left.evaluate_interval(arg),
+            self.right.evaluate_interval(arg)
+        )
+
+    def compile(self, compiler):
+        left = compiler(self.left)
+        right = compiler(self.right)
+        if not callable(left):
+            if not callable(right):
+                return left / right
+            return lambda x: left / right(x)
+        if not callable(right):
+            return lambda x: left(x) / right
+        return lambda x: left(x) / right(x)
+
     def diff(self):
         return Divide(
             subtract.Subtract(
-                multiply.Multiply(self.left.diff(), self.right.copy()),
-                multiply.Multiply(self.left.copy(), self.right.diff())
+                multiply.Multiply(self.left.diff(), self.right),
+                multiply.Multiply(self.left, self.right.diff())
             ),
             power.Pow(self.right, number.Number(2))
         )
 
-    def simplify(self):
-        self.left = self.left.simplify()
-        self.right = self.right.simplify()
-
-        if self.left is number.Number(0):
-            return number.Number(0)
-        if self.right is number.Number(0):
-            raise ZeroDivisionError
-        if isinstance(self.left, number.Number) and isinstance(self.right, number.Number):
-            if (self.left.value / self.right.value).is_integer():
-                return number.Number(self.left.value / self.right.value)
-
-        return super().simplify()
-
     def to_infix(self):
         return '({} / {})'.format(self.left.to_infix(), self.right.to_infix())
@@ -2,31 +2,30 @@
 
 import math
 
-from . import divide, node, number
+from .. import interval
+from . import divide, node
 
 
 class Ln(node.Node):
     """natural logarithm node"""
 
-    def __init__(self, arg):
-        self.arg = arg
-
-    def copy(self):
-        return Ln(self.arg.copy())
+    __slots__ = ('arg',)
+    _fields = ('arg',)
 
     def evaluate(self, value):
         return math.log(self.arg.evaluate(value))
 
-    def diff(self):
-        return divide.Divide(self.arg.diff(), self.arg)
+    def evaluate_many(self, values, lib):
+        return lib.log(self.arg.evaluate_many(values, lib))
 
-    def simplify(self):
-        self.arg = self.arg.simplify()
+    def evaluate_interval(self, arg):
+        return interval.log(self.arg.evaluate_interval(arg))
 
-        if self.arg is number.Number(1):
-            return number.Number(0)
+    def compile(self, compiler):
+        return self.compile_call(compiler, math.log, self.arg)
 
-        return super().simplify()
+    def diff(self):
+        return divide.Divide(self.arg.diff(), self.arg)
 
     def to_infix(self):
         return 'ln({})'.format(self.arg.to_infix())
@@ -2,15 +2,15 @@
 
 import math
 
+from .. import interval
 from . import divide, ln, node
 
 
 class Log(node.Node):
     """Logarithm node"""
 
-    def __init__(self, base, arg):
-        self.base = base
-        self.arg = arg
+    __slots__ = ('base', 'arg')
+    _fields = ('base', 'arg')
 
     def natural_log(self):
         """Returns the natural logarithm version of any
@@ -21,20 +21,35 @@ class Log(node.Node):
         """
         return divide.Divide(ln.Ln(self.arg), ln.Ln(self.base))
 
-    def copy(self):
-        return Log(self.arg.copy(), self.base.copy())
-
     def evaluate(self, value):
         return math.log(self.arg.evaluate(value), self.base.evaluate(value))
 
+    def evaluate_many(self, values, lib):
+        return lib.divide(
+            lib.log(self.arg.evaluate_many(values, lib)),
+            lib.log(self.base.evaluate_many(values, lib))
+        )
+
+    def evaluate_interval(self, arg):
+        return interval.divide(
+            interval.log(self.arg.evaluate_interval(arg)),
+            interval.log(self.base.evaluate_interval(arg))
+        )
+
+    def compile(self, compiler):
+        arg = compiler(self.arg)
+        base = compiler(self.base)
+        log = math.log
+        if not callable(base):
+            if not callable(arg):
+                return log(arg, base)
+            return lambda x: log(arg(x), base)
+        if not callable(arg):
+            return lambda x: log(arg, base(x))
+        return lambda x: log(arg(x), base(x))
+
     def diff(self):
         return self.natural_log().diff()
 
-    def simplify(self):
-        self.base = self.base.simplify()
-        self.arg = self.arg.simplify()
-
-        return super().simplify()
-
     def to_infix(self):
-        return 'log_{}({})'.format(self.base, self.arg.to_infix())
+        return 'log({}, {})'.format(self.base.to_infix(), self.arg.to_infix())
@@ -1,33 +1,32 @@
 """Negation node"""
 
-from . import node, number
+from . import node
 
 
 class Negate(node.Node):
     """Negation node"""
 
-    def __init__(self, arg):
-        self.arg = arg
-
-    def copy(self):
-        return Negate(self.arg.copy())
+    __slots__ = ('arg',)
+    _fields = ('arg',)
 
     def evaluate(self, value):
         return -self.arg.evaluate(value)
 
-    def diff(self):
-        return Negate(self.arg.diff())
-
-    def simplify(self):
-        self.arg = self.arg.simplify()
+    def evaluate_many(self, values, lib):
+        return lib.negative(self.arg.evaluate_many(values, lib))
 
-        if self.arg is number.Number(0):
-            return number.Number(0)
+    def evaluate_interval(self, arg):
+        lower, upper = self.arg.evaluate_interval(arg)
+        return -upper, -lower
 
-        if isinstance(self.arg, Negate):
-            return self.arg.arg.simplify()
+    def compile(self, compiler):
+        arg = compiler(self.arg)
+        if not callable(arg):
+            return -arg
+        return lambda x: -arg(x)
 
-        return super().simplify()
+    def diff(self):
+        return Negate(self.arg.diff())
 
     def to_infix(self):
         return '(-{})'.format(self.arg.to_infix())
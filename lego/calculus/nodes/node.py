@@ -2,14 +2,66 @@
 
 
 class Node:
-    """Abstract base class Node for the binary tree."""
+    """Abstract base class Node for the expression tree.
+    Nodes are immutable and hash-consed: constructing a node with the
+    same arguments returns the very same object, so identical subtrees
+    are stored once and can be compared with `is`.
+    Subclasses list their children in _fields, never assign to them.
+    The intern table only grows, its owner empties it with clear.
+    """
+
+    __slots__ = ('_hash',)
+    _fields = ()
+    _instances = dict()
+    # nodes surviving clear, e.g. the patterns of the simplifier
+    _permanent = dict()
+
+    def __new__(cls, *args):
+        key = (cls,) + args
+        obj = Node._instances.get(key)
+        if obj is None:
+            obj = super(Node, cls).__new__(cls)
+            for name, value in zip(cls._fields, args):
+                setattr(obj, name, value)
+            obj._hash = hash(key)
+            Node._instances[key] = obj
+        return obj
+
+    def __hash__(self):
+        return self._hash
+
+    @staticmethod
+    def keep():
+        """Makes the nodes created so far survive clear"""
+        Node._permanent = dict(Node._instances)
+
+    @staticmethod
+    def clear():
+        """Empties the intern table except for the kept nodes. Nodes
+        created afterwards aren't identical to equal ones created before,
+        so trees built before should be dropped as well.
+        """
+        Node._instances = dict(Node._permanent)
+
+    def children(self):
+        """Returns the child nodes
+
+        :return: Child nodes, in order of _fields
+        :rtype: tuple[Node]
+        """
+        return tuple(
+            child for child in (getattr(self, name) for name in self._fields)
+            if isinstance(child, Node)
+        )
 
     def copy(self):
-        """Returns a deep copy of a node
+        """Returns a copy of a node. Nodes are immutable,
+        so this is the node itself.
 
         :return: Copied node
         :rtype: Node
         """
+        return self
 
     def evaluate(self, value) -> float:
         """Evaluates the result of a Expression recursively, substituting
@@ -21,31 +73,59 @@ class Node:
         :rtype: float
         """
 
+    def evaluate_many(self, values, lib):
+        """Evaluates the Expression for many values of x at once,
+        recursively. Every node dispatches to a single vectorized
+        function of lib.
+
+        :param values: values for x
+        :type values: numpy.ndarray | array.array
+        :param lib: NumPy or a replacement providing the same ufuncs
+        :type lib: module | calculus.vector.ArrayLib
+        :return: Result of calculation, a scalar if independent of x
+        :rtype: numpy.ndarray | array.array | float
+        """
+
+    def evaluate_interval(self, arg):
+        """Evaluates guaranteed bounds of the Expression for all values
+        of x within an interval, recursively.
+
+        :param arg: Interval (lower, upper) of x
+        :type arg: tuple[float, float]
+        :raises EvaluationError: Not defined anywhere in the interval
+        :return: Interval (lower, upper) containing all results
+        :rtype: tuple[float, float]
+        """
+
+    def compile(self, compiler):
+        """Compiles the node into a closure f(x), recursively.
+        Subtrees not depending on x are folded into plain numbers.
+
+        :param compiler: Callable compiling the child nodes
+        :type compiler: Callable[[Node], Callable | float]
+        :return: Closure evaluating the node or the folded value
+        :rtype: Callable[[float], float] | float
+        """
+
+    def compile_call(self, compiler, func, arg):
+        """Compiles a node applying a single argument function.
+
+        :param compiler: Callable compiling the child nodes
+        :type compiler: Callable[[Node], Callable | float]
+        :param func: Function applied to the argument, e.g. math.sin
+        :type func: Callable[[float], float]
+        :param arg: Argument node
+        :type arg: Node
+        :return: Closure evaluating the node or the folded value
+        :rtype: Callable[[float], float] | float
+        """
+        arg = compiler(arg)
+        if not callable(arg):
+            return func(arg)
+        return lambda x: func(arg(x))
+
     def to_infix(self):
         """Converts a Expression to infix-notation, recursively."""
 
     def diff(self):
         "Returns a Expression Tree representing the derivative of the function"
-
-    def simplify(self):
-        """Tries to simplify the Expression as much as possible
-        Trying to implement:
-            - Calculate Explicit Numbers
-            - x + 0 -> x
-            - x - 0 -> x
-            - 0 - x -> -x
-            - x * 0 -> 0
-            - x * 1 -> x
-            - x / 1 -> x
-            - x ^ 0 -> 1
-            - x ^ 1 -> x
-            - x * (y / z) -> (x * y) / z
-
-            TODO:
-            - Simplifying Fractions
-            - Unifiying same denominator / Fraction Rules
-            - Power Rules
-            - Extended Parenthesis Rules
-
-            """
-        return self
@@ -6,23 +6,19 @@ from . import node
 class Number(node.Node):
     """Number node. Multiton"""
 
-    _instances = dict()
+    __slots__ = ('value',)
+    _fields = ('value',)
 
-    def __new__(cls, value):
-        if value in cls._instances:
-            return cls._instances[value]
-        else:
-            obj = super(Number, cls).__new__(cls)
-            cls._instances[value] = obj
-            return obj
+    def evaluate(self, _):
+        return self.value
 
-    def __init__(self, value):
-        self.value = value
+    def evaluate_many(self, values, lib):
+        return self.value
 
-    def copy(self):
-        return Number(self.value)
+    def evaluate_interval(self, arg):
+        return self.value, self.value
 
-    def evaluate(self, _):
+    def compile(self, compiler):
         return self.value
 
     def diff(self):
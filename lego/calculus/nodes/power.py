@@ -1,61 +1,77 @@
 """Power node"""
 
+from .. import interval
 from . import constant, ln, multiply, node, number, variable
 
 
 class Pow(node.Node):
     """Power node"""
 
-    def __init__(self, left=None, right=None):
-        self.left = left
-        self.right = right
-
-    def copy(self):
-        return Pow(self.left.copy(), self.right.copy())
+    __slots__ = ('left', 'right')
+    _fields = ('left', 'right')
 
     def evaluate(self, value):
         return self.left.evaluate(value) ** self.right.evaluate(value)
 
+    def evaluate_many(self, values, lib):
+        return lib.power(
+            self.left.evaluate_many(values, lib),
+            self.right.evaluate_many(values, lib)
+        )
+
+    def evaluate_interval(self, arg):
+        return interval.power(
+            self.left.evaluate_interval(arg),
+            self.right.evaluate_interval(arg)
+        )
+
+    def compile(self, compiler):
+        left = compiler(self.left)
+        right = compiler(self.right)
+        if not callable(left):
+            if not callable(right):
+                return left ** right
+            return lambda x: left ** right(x)
+        if not callable(right):
+            return lambda x: left(x) ** right
+        return lambda x: left(x) ** right(x)
+
     def diff(self):
         if isinstance(self.left, variable.Variable) and isinstance(self.right, number.Number):
             return multiply.Multiply(
-                self.right.copy(),
+                self.right,
                 Pow(
-                    self.left.copy(),
+                    self.left,
                     number.Number(self.right.value - 1)
                 )
             )
 
+        # chain rule, avoids ln of a possibly negative base
+        if isinstance(self.right, number.Number):
+            return multiply.Multiply(
+                self.left.diff(),
+                multiply.Multiply(
+                    self.right,
+                    Pow(
+                        self.left,
+                        number.Number(self.right.value - 1)
+                    )
+                )
+            )
+
         if self.left is constant.Constant('e'):
             return multiply.Multiply(
                 self.right.diff(),
-                self.copy()
+                self
             )
 
         return multiply.Multiply(
-            self.copy(),
+            self,
             multiply.Multiply(
-                ln.Ln(self.left.copy()),
-                self.right.copy()
+                ln.Ln(self.left),
+                self.right
             ).diff()
         )
 
-    def simplify(self):
-        self.left = self.left.simplify()
-        self.right = self.right.simplify()
-
-        if self.right is number.Number(0):
-            return number.Number(1)
-        if self.left is number.Number(0):
-            return number.Number(0)
-
-        if self.right is number.Number(1):
-            return self.left
-
-        if isinstance(self.left, number.Number) and isinstance(self.right, number.Number):
-            return number.Number(self.left.value ** self.right.value)
-
-        return super().simplify()
-
     def to_infix(self):
         return '({} ^ {})'.format(self.left.to_infix(), self.right.to_infix())
@@ -6,9 +6,8 @@ from . import divide, node, number, power
 class Root(node.Node):
     """Root node"""
 
-    def __init__(self, degree, radicand):
-        self.degree = degree
-        self.radicand = radicand
+    __slots__ = ('degree', 'radicand')
+    _fields = ('degree', 'radicand')
 
     def power(self):
         """Returns a representation of a root as a power
@@ -18,18 +17,20 @@ class Root(node.Node):
         """
         return power.Pow(self.radicand, divide.Divide(number.Number(1), self.degree))
 
-    def copy(self):
-        return Root(self.degree.copy(), self.radicand.copy())
-
     def evaluate(self, value):
         return self.power().evaluate(value)
 
+    def evaluate_many(self, values, lib):
+        return self.power().evaluate_many(values, lib)
+
+    def evaluate_interval(self, arg):
+        return self.power().evaluate_interval(arg)
+
+    def compile(self, compiler):
+        return compiler(self.power())
+
     def diff(self):
         return self.power().diff()
 
-    def simplify(self):
-        self.radicand = self.radicand.simplify()
-        return super().simplify()
-
     def to_infix(self):
         return 'nrt({},{})'.format(self.degree.to_infix(), self.radicand.to_infix())
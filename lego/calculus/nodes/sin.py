@@ -2,31 +2,30 @@
 
 import math
 
-from . import cos, multiply, node, number
+from .. import interval
+from . import cos, multiply, node
 
 
 class Sin(node.Node):
     """Sin node"""
 
-    def __init__(self, arg):
-        self.arg = arg
-
-    def copy(self):
-        return Sin(self.arg.copy())
+    __slots__ = ('arg',)
+    _fields = ('arg',)
 
     def evaluate(self, value):
         return math.sin(self.arg.evaluate(value))
 
-    def diff(self):
-        return multiply.Multiply(self.arg.diff(), cos.Cos(self.arg))
+    def evaluate_many(self, values, lib):
+        return lib.sin(self.arg.evaluate_many(values, lib))
 
-    def simplify(self):
-        self.arg = self.arg.simplify()
+    def evaluate_interval(self, arg):
+        return interval.sin(self.arg.evaluate_interval(arg))
 
-        if self.arg is number.Number(0):
-            return number.Number(0)
+    def compile(self, compiler):
+        return self.compile_call(compiler, math.sin, self.arg)
 
-        return super().simplify()
+    def diff(self):
+        return multiply.Multiply(self.arg.diff(), cos.Cos(self.arg))
 
     def to_infix(self):
         return 'sin({})'.format(self.arg.to_infix())
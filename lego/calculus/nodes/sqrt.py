@@ -2,36 +2,33 @@
 
 import math
 
-from . import node, number, power
+from .. import interval
+from . import divide, multiply, node, number
 
 
 class Sqrt(node.Node):
     """Sqrt node. Simpler version of root for degree=2"""
 
-    def __init__(self, radicand):
-        self.radicand = radicand
-
-    def copy(self):
-        return Sqrt(self.radicand.copy())
+    __slots__ = ('radicand',)
+    _fields = ('radicand',)
 
     def evaluate(self, value):
-        return math.sqrt(value.evaluate())
-
-    def simplify(self):
-        self.radicand = self.radicand.simplify()
+        return math.sqrt(self.radicand.evaluate(value))
 
-        if isinstance(self.radicand, power.Pow):
-            exponent = self.radicand.right
-            if isinstance(exponent, number.Number) and exponent.value == 2:
-                return self.radicand.left.simplify()
+    def evaluate_many(self, values, lib):
+        return lib.sqrt(self.radicand.evaluate_many(values, lib))
 
-        if self.radicand is number.Number(0):
-            return number.Number(0)
+    def evaluate_interval(self, arg):
+        return interval.sqrt(self.radicand.evaluate_interval(arg))
 
-        if self.radicand is number.Number(1):
-            return number.Number(1)
+    def compile(self, compiler):
+        return self.compile_call(compiler, math.sqrt, self.radicand)
 
-        return super().simplify()
+    def diff(self):
+        return divide.Divide(
+            self.radicand.diff(),
+            multiply.Multiply(number.Number(2), self)
+        )
 
     def to_infix(self):
         return 'sqrt({})'.format(self.radicand.to_infix())
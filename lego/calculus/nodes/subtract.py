@@ -1,36 +1,41 @@
 """Subtract node"""
 
-from . import negate, node, number
+from . import node
 
 
 class Subtract(node.Node):
     """Subtract node"""
 
-    def __init__(self, left=None, right=None):
-        self.left = left
-        self.right = right
-
-    def copy(self):
-        return Subtract(self.left.copy(), self.right.copy())
+    __slots__ = ('left', 'right')
+    _fields = ('left', 'right')
 
     def evaluate(self, value):
         return self.left.evaluate(value) - self.right.evaluate(value)
 
+    def evaluate_many(self, values, lib):
+        return lib.subtract(
+            self.left.evaluate_many(values, lib),
+            self.right.evaluate_many(values, lib)
+        )
+
+    def evaluate_interval(self, arg):
+        left = self.left.evaluate_interval(arg)
+        right = self.right.evaluate_interval(arg)
+        return left[0] - right[1], left[1] - right[0]
+
+    def compile(self, compiler):
+        left = compiler(self.left)
+        right = compiler(self.right)
+        if not callable(left):
+            if not callable(right):
+                return left - right
+            return lambda x: left - right(x)
+        if not callable(right):
+            return lambda x: left(x) - right
+        return lambda x: left(x) - right(x)
+
     def diff(self):
         return Subtract(self.left.diff(), self.right.diff())
 
-    def simplify(self):
-        self.left = self.left.simplify()
-        self.right = self.right.simplify()
-
-        if self.left is number.Number(0):
-            return negate.Negate(self.right)
-        if self.right is number.Number(0):
-            return self.left
-        if isinstance(self.left, number.Number) and isinstance(self.right, number.Number):
-            return number.Number(self.left.value - self.right.value)
-
-        return super().simplify()
-
     def to_infix(self):
         return '({} - {})'.format(self.left.to_infix(), self.right.to_infix())
@@ -2,21 +2,28 @@
 
 import math
 
+from .. import interval
 from . import cos, divide, multiply, node, number, power
 
 
 class Tan(node.Node):
     """Tan node"""
 
-    def __init__(self, arg):
-        self.arg = arg
-
-    def copy(self):
-        return Tan(self.arg.copy())
+    __slots__ = ('arg',)
+    _fields = ('arg',)
 
     def evaluate(self, value):
         return math.tan(self.arg.evaluate(value))
 
+    def evaluate_many(self, values, lib):
+        return lib.tan(self.arg.evaluate_many(values, lib))
+
+    def evaluate_interval(self, arg):
+        return interval.tan(self.arg.evaluate_interval(arg))
+
+    def compile(self, compiler):
+        return self.compile_call(compiler, math.tan, self.arg)
+
     def diff(self):
         return multiply.Multiply(
             self.arg.diff(),
@@ -29,13 +36,5 @@ class Tan(node.Node):
             )
         )
 
-    def simplify(self):
-        self.arg = self.arg.simplify()
-
-        if self.arg is number.Number(0):
-            return number.Number(0)
-
-        return super().simplify()
-
     def to_infix(self):
         return '(tan({}))'.format(self.arg.to_infix())
@@ -4,14 +4,22 @@ from . import node, number
 
 
 class Variable(node.Node):
-    """Variable node. Represents x in an Expression"""
+    """Variable node. Singleton. Represents x in an Expression"""
 
-    def copy(self):
-        return Variable()
+    __slots__ = ()
 
     def evaluate(self, value):
         return value
 
+    def evaluate_many(self, values, lib):
+        return values
+
+    def evaluate_interval(self, arg):
+        return arg
+
+    def compile(self, compiler):
+        return lambda x: x
+
     def diff(self):
         return number.Number(1)
 
@@ -0,0 +1,354 @@
+"""
+Simplification of Expression trees.
+Rewrites the tree bottom-up with a table of rules until no rule applies
+anymore. Rules are looked up by the type of the node and are either
+identities, written as pattern -> replacement trees, or functions
+returning the rewritten node or None.
+
+Current Rules:
+    - Calculate Explicit Numbers
+    - Flatten chains of + and -, collect like terms: 2x + 3x -> 5x
+    - Flatten chains of *, collect like factors: x * x -> x ^ 2
+    - x + 0 -> x, x - 0 -> x, 0 - x -> -x, -(-x) -> x
+    - x * 0 -> 0, x * 1 -> x
+    - x / 1 -> x, 0 / x -> 0, x / x -> 1
+    - x * (y / z) -> (x * y) / z
+    - (x / y) / z -> x / (y * z), x / (y / z) -> (x * z) / y
+    - x ^ 0 -> 1, x ^ 1 -> x, 0 ^ x -> 0, 1 ^ x -> 1
+    - (x ^ a) ^ n -> x ^ (a * n), for integers n
+    - Function values at 0 and 1, e.g. sin(0) -> 0, ln(1) -> 0
+"""
+
+from .nodes import (Acos, Add, Asin, Atan, Constant, Cos, Divide, Ln, Log,
+                    Multiply, Negate, Number, Pow, Root, Sin, Sqrt, Subtract,
+                    Tan)
+from .nodes.node import Node
+
+
+class _Any(Node):
+    """Placeholder matching any subtree in a pattern.
+    Placeholders with the same name match the same subtree.
+    """
+
+    __slots__ = ('name',)
+    _fields = ('name',)
+
+
+A = _Any('a')
+B = _Any('b')
+C = _Any('c')
+
+ZERO = Number(0)
+ONE = Number(1)
+TWO = Number(2)
+E = Constant('e')
+
+IDENTITIES = (
+    (Divide(A, ONE), A),
+    (Divide(ZERO, A), ZERO),
+    (Divide(A, A), ONE),
+    (Divide(Divide(A, B), C), Divide(A, Multiply(B, C))),
+    (Divide(A, Divide(B, C)), Divide(Multiply(A, C), B)),
+    (Multiply(A, Divide(B, C)), Divide(Multiply(A, B), C)),
+    (Multiply(Divide(A, B), C), Divide(Multiply(A, C), B)),
+    (Pow(A, ZERO), ONE),
+    (Pow(A, ONE), A),
+    (Pow(ZERO, A), ZERO),
+    (Pow(ONE, A), ONE),
+    (Sqrt(ZERO), ZERO),
+    (Sqrt(ONE), ONE),
+    (Root(TWO, A), Sqrt(A)),
+    (Sin(ZERO), ZERO),
+    (Cos(ZERO), ONE),
+    (Tan(ZERO), ZERO),
+    (Asin(ZERO), ZERO),
+    (Acos(ONE), ZERO),
+    (Atan(ZERO), ZERO),
+    (Ln(ONE), ZERO),
+    (Ln(E), ONE),
+    (Ln(Pow(E, A)), A),
+    (Log(A, ONE), ZERO),
+    (Log(A, A), ONE),
+)
+
+
+def _match(pattern, node, bindings):
+    """Matches a node against a pattern, binding placeholders.
+
+    :return: True if the node matches
+    :rtype: bool
+    """
+    if isinstance(pattern, _Any):
+        bound = bindings.get(pattern.name)
+        if bound is None:
+            bindings[pattern.name] = node
+            return True
+        return bound is node
+
+    if type(pattern) is not type(node):
+        return False
+
+    children = pattern.children()
+    if not children:
+        return pattern is node
+
+    for pattern_child, child in zip(children, node.children()):
+        if not _match(pattern_child, child, bindings):
+            return False
+    return True
+
+
+def _substitute(replacement, bindings):
+    """Builds the replacement tree, substituting placeholders."""
+    if isinstance(replacement, _Any):
+        return bindings[replacement.name]
+
+    children = replacement.children()
+    if not children:
+        return replacement
+    return type(replacement)(*[_substitute(child, bindings) for child in children])
+
+
+def _identity(pattern, replacement):
+    """Creates a rule rewriting pattern to replacement."""
+    def rule(node):
+        bindings = {}
+        if _match(pattern, node, bindings):
+            return _substitute(replacement, bindings)
+        return None
+    return rule
+
+
+def _real(value):
+    """Returns value as Number if it is a finite real number, else None."""
+    if not isinstance(value, (int, float)) or value != value:
+        return None
+    if value in (float('inf'), float('-inf')):
+        return None
+    return Number(value)
+
+
+def _fold_power(node):
+    """Calculates powers of explicit Numbers."""
+    if isinstance(node.left, Number) and isinstance(node.right, Number):
+        try:
+            return _real(node.left.value ** node.right.value)
+        except (ZeroDivisionError, OverflowError):
+            return None
+    return None
+
+
+def _power_of_power(node):
+    """(x ^ a) ^ n -> x ^ (a * n), for integers n"""
+    base, exponent = node.left, node.right
+    if isinstance(base, Pow) and isinstance(exponent, Number) \
+            and exponent.value == int(exponent.value):
+        return Pow(base.left, Multiply(base.right, exponent))
+    return None
+
+
+def _fold_fraction(node):
+    """Calculates fractions of explicit Numbers, if the result is whole.
+    Division by zero raises ZeroDivisionError.
+    """
+    if node.right is ZERO:
+        raise ZeroDivisionError
+    if isinstance(node.left, Number) and isinstance(node.right, Number):
+        quotient = node.left.value / node.right.value
+        if quotient == int(quotient):
+            return Number(quotient)
+    return None
+
+
+def _terms(node, coefficient, terms, index):
+    """Flattens a chain of +, - and negations into terms.
+
+    :param node: Node to flatten
+    :type node: Node
+    :param coefficient: Factor of the node
+    :type coefficient: int | float
+    :param terms: List of [term, coefficient], term None for numbers
+    :type terms: list[list]
+    :param index: Position of each term in terms
+    :type index: dict[Node | None, int]
+    """
+    if isinstance(node, Add):
+        _terms(node.left, coefficient, terms, index)
+        _terms(node.right, coefficient, terms, index)
+        return
+    if isinstance(node, Subtract):
+        _terms(node.left, coefficient, terms, index)
+        _terms(node.right, -coefficient, terms, index)
+        return
+    if isinstance(node, Negate):
+        _terms(node.arg, -coefficient, terms, index)
+        return
+
+    term = node
+    if isinstance(node, Number):
+        coefficient *= node.value
+        term = None
+    elif isinstance(node, Multiply) and isinstance(node.left, Number):
+        coefficient *= node.left.value
+        term = node.right
+
+    if term in index:
+        terms[index[term]][1] += coefficient
+    else:
+        index[term] = len(terms)
+        terms.append([term, coefficient])
+
+
+def _scaled(coefficient, term):
+    """Returns coefficient * term for a positive coefficient."""
+    if coefficient == 1:
+        return term
+    return Multiply(Number(coefficient), term)
+
+
+def _collect_terms(node):
+    """Flattens chains of +, - and negations, folds numbers and
+    collects like terms: 2x + x - 3 + 1 -> 3x - 2
+    """
+    terms = []
+    _terms(node, 1, terms, {})
+
+    result = None
+    constant = 0
+    for term, coefficient in terms:
+        if term is None:
+            constant = coefficient
+            continue
+        if coefficient == 0:
+            continue
+        if result is None:
+            if coefficient < 0:
+                result = Negate(_scaled(-coefficient, term))
+            else:
+                result = _scaled(coefficient, term)
+        elif coefficient < 0:
+            result = Subtract(result, _scaled(-coefficient, term))
+        else:
+            result = Add(result, _scaled(coefficient, term))
+
+    if result is None:
+        return Number(constant)
+    if constant < 0:
+        return Subtract(result, Number(-constant))
+    if constant > 0:
+        return Add(result, Number(constant))
+    return result
+
+
+def _factors(node, factors, index):
+    """Flattens a chain of * into factors, returns the numeric coefficient.
+
+    :param node: Node to flatten
+    :type node: Node
+    :param factors: List of [base, exponent]
+    :type factors: list[list]
+    :param index: Position of each base in factors
+    :type index: dict[Node, int]
+    :return: Product of all explicit Numbers
+    :rtype: int | float
+    """
+    if isinstance(node, Multiply):
+        return _factors(node.left, factors, index) * _factors(node.right, factors, index)
+    if isinstance(node, Negate):
+        return -_factors(node.arg, factors, index)
+    if isinstance(node, Number):
+        return node.value
+
+    base, exponent = node, ONE
+    if isinstance(node, Pow):
+        base, exponent = node.left, node.right
+
+    if base in index:
+        factor = factors[index[base]]
+        factor[1] = Add(factor[1], exponent)
+    else:
+        index[base] = len(factors)
+        factors.append([base, exponent])
+    return 1
+
+
+def _collect_factors(node):
+    """Flattens chains of *, folds numbers and collects like
+    factors as powers: 2 * x * x * 3 -> 6 * x ^ 2
+    """
+    factors = []
+    coefficient = _factors(node, factors, {})
+    if coefficient == 0:
+        return ZERO
+
+    result = None
+    for base, exponent in factors:
+        factor = base if exponent is ONE else Pow(base, exponent)
+        result = factor if result is None else Multiply(result, factor)
+
+    if result is None:
+        return Number(coefficient)
+    if coefficient == 1:
+        return result
+    if coefficient == -1:
+        return Negate(result)
+    return Multiply(Number(coefficient), result)
+
+
+RULES = dict()
+for _pattern, _replacement in IDENTITIES:
+    RULES.setdefault(type(_pattern), []).append(_identity(_pattern, _replacement))
+
+RULES.setdefault(Add, []).append(_collect_terms)
+RULES.setdefault(Subtract, []).append(_collect_terms)
+RULES.setdefault(Negate, []).append(_collect_terms)
+RULES.setdefault(Multiply, []).append(_collect_factors)
+RULES.setdefault(Divide, []).insert(0, _fold_fraction)
+RULES.setdefault(Pow, []).extend((_fold_power, _power_of_power))
+
+
+def _rewrite(node):
+    """Applies the first rule changing the node.
+
+    :return: Rewritten node or the node itself
+    :rtype: Node
+    """
+    for rule in RULES.get(type(node), ()):
+        result = rule(node)
+        if result is not None and result is not node:
+            return result
+    return node
+
+
+def simplify(tree):
+    """Simplifies the tree bottom-up. Every rewritten node is simplified
+    again, until no rule applies anymore (fixpoint).
+    Identical subtrees are the same object and simplified once.
+
+    :param tree: Root Node
+    :type tree: Node
+    :raises ZeroDivisionError: Division by zero
+    :return: Simplified tree
+    :rtype: Node
+    """
+    memo = {}
+
+    def visit(node):
+        result = memo.get(node)
+        if result is not None:
+            return result
+
+        children = node.children()
+        result = node
+        if children:
+            result = type(node)(*[visit(child) for child in children])
+
+        rewritten = _rewrite(result)
+        if rewritten is not result:
+            rewritten = visit(rewritten)
+
+        memo[node] = rewritten
+        memo[result] = rewritten
+        return rewritten
+
+    return visit(tree)
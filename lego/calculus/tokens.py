@@ -0,0 +1,42 @@
+"""
+Token types of the RPN-Notation sent by the app, shared by the string
+parser of Expression and the binary wire format.
+"""
+
+from .nodes import (Acos, Add, Asin, Atan, Constant, Cos, Divide, Ln, Log,
+                    Multiply, Negate, Number, Pow, Root, Sin, Sqrt, Subtract,
+                    Tan)
+
+E = 2.718281828459045
+
+# node and number of arguments per operation
+OPERATIONS = {
+    'UNMINUS': (Negate, 1),
+    'PLUS': (Add, 2),
+    'MINUS': (Subtract, 2),
+    'TIMES': (Multiply, 2),
+    'DIV': (Divide, 2),
+    'POW': (Pow, 2),
+    'LOG': (Log, 2),
+    'LN': (Ln, 1),
+    'SQRT': (Sqrt, 1),
+    'ROOT': (Root, 2),
+    'SIN': (Sin, 1),
+    'ASIN': (Asin, 1),
+    'TAN': (Tan, 1),
+    'ATAN': (Atan, 1),
+    'COS': (Cos, 1),
+    'ACOS': (Acos, 1),
+}
+
+
+def number(value):
+    """Creates the node of a value, e is sent as its value.
+
+    :param value: Value of the token
+    :type value: float
+    :rtype: Number | Constant
+    """
+    if value == E:
+        return Constant('e')
+    return Number(value)
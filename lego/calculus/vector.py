@@ -0,0 +1,123 @@
+"""
+Backends for evaluating a Expression over many values at once.
+Uses NumPy if it is installed, otherwise falls back to array.array
+with the math module. Both backends expose the same ufunc names, so
+every node dispatches its operation once per array instead of once
+per value.
+"""
+
+import math
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _scalar(func, *args):
+    """Applies func to scalars, returning nan on a math domain error."""
+    try:
+        return float(func(*args))
+    except (ValueError, ZeroDivisionError, OverflowError):
+        return math.nan
+
+
+def _map(func, *args):
+    """Applies func elementwise over arrays, broadcasting scalars.
+
+    :param func: Scalar function
+    :type func: Callable
+    :return: Result of the elementwise application
+    :rtype: array.array | float
+    """
+    arrays = [arg for arg in args if isinstance(arg, array)]
+    if not arrays:
+        return _scalar(func, *args)
+
+    length = len(arrays[0])
+    columns = [arg if isinstance(arg, array) else [arg] * length
+               for arg in args]
+    return array('d', [_scalar(func, *row) for row in zip(*columns)])
+
+
+class ArrayLib:
+    """Stand-in for the NumPy ufuncs used by the nodes,
+    working on array.array('d') and floats.
+    Domain errors result in nan, like NumPy.
+    """
+
+    @staticmethod
+    def asarray(values, dtype=float):
+        return values if isinstance(values, array) else array('d', values)
+
+    @staticmethod
+    def full(length, value):
+        return array('d', [value]) * length
+
+    @staticmethod
+    def add(left, right):
+        return _map(lambda a, b: a + b, left, right)
+
+    @staticmethod
+    def subtract(left, right):
+        return _map(lambda a, b: a - b, left, right)
+
+    @staticmethod
+    def multiply(left, right):
+        return _map(lambda a, b: a * b, left, right)
+
+    @staticmethod
+    def divide(left, right):
+        return _map(lambda a, b: a / b, left, right)
+
+    @staticmethod
+    def power(left, right):
+        return _map(math.pow, left, right)
+
+    @staticmethod
+    def negative(arg):
+        return _map(lambda a: -a, arg)
+
+    @staticmethod
+    def sin(arg):
+        return _map(math.sin, arg)
+
+    @staticmethod
+    def cos(arg):
+        return _map(math.cos, arg)
+
+    @staticmethod
+    def tan(arg):
+        return _map(math.tan, arg)
+
+    @staticmethod
+    def arcsin(arg):
+        return _map(math.asin, arg)
+
+    @staticmethod
+    def arccos(arg):
+        return _map(math.acos, arg)
+
+    @staticmethod
+    def arctan(arg):
+        return _map(math.atan, arg)
+
+    @staticmethod
+    def log(arg):
+        return _map(math.log, arg)
+
+    @staticmethod
+    def sqrt(arg):
+        return _map(math.sqrt, arg)
+
+
+def get_lib():
+    """Returns the backend, NumPy is preferred whenever it is installed.
+
+    :return: Module or class providing the ufuncs
+    :rtype: module | ArrayLib
+    """
+    if numpy is not None:
+        return numpy
+    return ArrayLib
@@ -0,0 +1,202 @@
+"""
+Binary wire format for expressions, replacing the JSON token strings.
+
+A frame starts with a header of 6 bytes, little endian:
+    magic (0xB5), version, flags, priority (signed), length of the body
+Flags: bit 0 the pen is lifted, bit 1 stream the progress, bit 2 the
+body is a batch.
+The body is the expression in RPN-Notation, one byte per token,
+numbers (VAL) followed by their value as float64. A batch body holds
+several expressions, each preceded by its length as uint16.
+
+The magic byte never starts a JSON request, so both can be served
+on the same port.
+"""
+
+try:
+    import struct
+except ImportError:
+    import ustruct as struct
+
+from . import tokens
+from .exception import ParsingError
+from .nodes import Variable
+
+MAGIC = 0xB5
+VERSION = 1
+
+HEADER = '<BBBbH'
+HEADER_SIZE = struct.calcsize(HEADER)
+VALUE = '<d'
+VALUE_SIZE = struct.calcsize(VALUE)
+LENGTH = '<H'
+LENGTH_SIZE = struct.calcsize(LENGTH)
+
+LIFTED = 1
+STREAM = 2
+BATCH = 4
+
+# token types of the RPN-Notation
+OPCODES = {
+    'VAL': 1,
+    'VAR': 2,
+    'UNMINUS': 3,
+    'PLUS': 4,
+    'MINUS': 5,
+    'TIMES': 6,
+    'DIV': 7,
+    'POW': 8,
+    'LOG': 9,
+    'LN': 10,
+    'SQRT': 11,
+    'ROOT': 12,
+    'SIN': 13,
+    'ASIN': 14,
+    'TAN': 15,
+    'ATAN': 16,
+    'COS': 17,
+    'ACOS': 18,
+}
+
+# node and number of arguments per opcode
+_OPERATIONS = dict((OPCODES[type_], operation)
+                   for type_, operation in tokens.OPERATIONS.items())
+
+
+def encode(token_strings):
+    """Encodes tokens in RPN-Notation into the body of a frame.
+
+    :param token_strings: Tokens like '(VAL:0.1)'
+    :type token_strings: list[str]
+    :raises ParsingError: Unknown token type
+    :return: Body
+    :rtype: bytes
+    """
+    body = bytearray()
+    for token in token_strings:
+        type_, value = token.strip('()').split(':')
+        opcode = OPCODES.get(type_)
+        if opcode is None:
+            raise ParsingError('Unknown token {}'.format(token))
+        body.append(opcode)
+        if opcode == OPCODES['VAL']:
+            body.extend(struct.pack(VALUE, float(value)))
+    return bytes(body)
+
+
+def encode_batch(bodies):
+    """Joins the bodies of several expressions into the body of a batch.
+
+    :param bodies: Bodies returned by encode
+    :type bodies: list[bytes]
+    :return: Body
+    :rtype: bytes
+    """
+    batch = bytearray()
+    for body in bodies:
+        batch.extend(struct.pack(LENGTH, len(body)))
+        batch.extend(body)
+    return bytes(batch)
+
+
+def split_batch(batch):
+    """Splits the body of a batch into the bodies of its expressions.
+
+    :param batch: Body returned by encode_batch
+    :type batch: bytes
+    :raises ParsingError: Length exceeds the batch
+    :return: Bodies
+    :rtype: list[bytes]
+    """
+    bodies = []
+    index = 0
+    while index < len(batch):
+        if index + LENGTH_SIZE > len(batch):
+            raise ParsingError('Incomplete length at byte {}'.format(index))
+        length = struct.unpack_from(LENGTH, batch, index)[0]
+        index += LENGTH_SIZE
+        if index + length > len(batch):
+            raise ParsingError('Incomplete expression at byte {}'.format(index))
+        bodies.append(batch[index:index + length])
+        index += length
+    return bodies
+
+
+def encode_frame(body, lifted=False, priority=0, stream=False, batch=False):
+    """Prepends the header to a body.
+
+    :param body: Body returned by encode or encode_batch
+    :type body: bytes
+    :param batch: body was returned by encode_batch, defaults to False
+    :type batch: bool, optional
+    :return: Frame
+    :rtype: bytes
+    """
+    flags = ((LIFTED if lifted else 0) | (STREAM if stream else 0)
+             | (BATCH if batch else 0))
+    return struct.pack(HEADER, MAGIC, VERSION, flags, priority, len(body)) + body
+
+
+def decode_header(header):
+    """Decodes the header of a frame.
+
+    :param header: First HEADER_SIZE bytes of the frame
+    :type header: bytes
+    :raises ParsingError: Not a frame or unsupported version
+    :return: lifted, stream, batch, priority and length of the body
+    :rtype: tuple[bool, bool, bool, int, int]
+    """
+    if len(header) < HEADER_SIZE:
+        raise ParsingError('Incomplete header')
+    magic, version, flags, priority, length = struct.unpack_from(HEADER, header, 0)
+    if magic != MAGIC:
+        raise ParsingError('Not a binary frame')
+    if version != VERSION:
+        raise ParsingError('Unsupported version {}'.format(version))
+    return (bool(flags & LIFTED), bool(flags & STREAM), bool(flags & BATCH),
+            priority, length)
+
+
+def decode(body):
+    """Decodes a body straight into the parse stack, without creating
+    token strings.
+
+    :param body: Body of a frame
+    :type body: bytes | bytearray | memoryview
+    :raises ParsingError: Input is not a correct expression
+    :return: Root Node of Expression Tree
+    :rtype: Node
+    """
+    view = memoryview(body)
+    stack = []
+    index = 0
+    length = len(view)
+    while index < length:
+        opcode = view[index]
+        index += 1
+
+        if opcode == 1:  # VAL
+            if index + VALUE_SIZE > length:
+                raise ParsingError('Incomplete number at byte {}'.format(index))
+            stack.append(tokens.number(struct.unpack_from(VALUE, view, index)[0]))
+            index += VALUE_SIZE
+            continue
+        if opcode == 2:  # VAR
+            stack.append(Variable())
+            continue
+
+        operation = _OPERATIONS.get(opcode)
+        if operation is None:
+            raise ParsingError('Unknown opcode {} at byte {}'.format(opcode, index - 1))
+        node, arity = operation
+        if len(stack) < arity:
+            raise ParsingError('Missing argument at byte {}'.format(index - 1))
+        if arity == 1:
+            stack.append(node(stack.pop()))
+        else:
+            right = stack.pop()
+            stack.append(node(stack.pop(), right))
+
+    if len(stack) != 1:
+        raise ParsingError('The input is not a correct expression')
+    return stack[0]
@@ -0,0 +1,267 @@
+"""
+Queue of drawing jobs for the plotter server.
+Jobs are ordered by priority, jobs with the same priority first in first
+out. Every change is appended to a journal file of JSON lines, so queued
+jobs survive a restart of the brick. The journal is replayed and
+compacted when the queue is created. A compacted journal starts with
+the next id, so ids given to clients are never given again.
+"""
+
+import json
+
+try:
+    import binascii
+except ImportError:
+    import ubinascii as binascii
+
+QUEUED = 'queued'
+DRAWING = 'drawing'
+DONE = 'done'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+
+# finished jobs kept for status queries
+KEEP_FINISHED = 16
+
+
+def _encode(tokens):
+    """Makes the bytes of a binary frame fit into JSON"""
+    if isinstance(tokens, bytes):
+        return {'wire': binascii.hexlify(tokens).decode('ascii')}
+    return tokens
+
+
+def _decode(tokens):
+    if isinstance(tokens, dict):
+        return binascii.unhexlify(tokens['wire'])
+    return tokens
+
+
+class Job:
+    """Drawing of one expression or, if batch is set, of a list of
+    expressions drawn together. Tokens of an expression are either
+    strings in RPN-Notation, the body of a binary frame (calculus.wire)
+    or a string in infix-notation.
+    """
+
+    def __init__(self, id_, tokens, lifted=False, priority=0, status=QUEUED,
+                 batch=False):
+        self.id = id_
+        self.tokens = tokens
+        self.lifted = lifted
+        self.priority = priority
+        self.status = status
+        self.batch = batch
+        # reason of a FAILED job
+        self.error = None
+
+    def expressions(self):
+        """Returns the tokens of every expression of the job
+
+        :rtype: list[list[str] | bytes | str]
+        """
+        return self.tokens if self.batch else [self.tokens]
+
+    def to_dict(self):
+        """Converts the job to a dict, as written to the journal
+
+        :rtype: dict
+        """
+        if self.batch:
+            tokens = [_encode(tokens) for tokens in self.tokens]
+        else:
+            tokens = _encode(self.tokens)
+        return {
+            'id': self.id,
+            'tokens': tokens,
+            'batch': self.batch,
+            'lifted': self.lifted,
+            'priority': self.priority,
+            'status': self.status
+        }
+
+
+class JobQueue:
+    """Priority queue of Jobs backed by a journal.
+
+    :param journal: Path of the journal file, None keeps the queue in memory
+    :type journal: str | None
+    """
+
+    def __init__(self, journal=None):
+        self.journal = journal
+        # queued jobs, highest priority first
+        self._queue = []
+        self._jobs = dict()
+        self._finished = []
+        self._next_id = 1
+        self.current = None
+
+        if journal is not None:
+            self._recover()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def _write(self, entries, mode='a'):
+        """Appends entries to the journal"""
+        if self.journal is None:
+            return
+        with open(self.journal, mode) as file:
+            for entry in entries:
+                file.write(json.dumps(entry) + '\n')
+
+    def _compact(self):
+        """Rewrites the journal with the next id and the queued jobs"""
+        entries = [{'next_id': self._next_id}]
+        entries.extend(job.to_dict() for job in self._queue)
+        self._write(entries, 'w')
+
+    def _recover(self):
+        """Replays the journal and rewrites it with the queued jobs only.
+        Jobs drawing during the restart are queued again. Entries that
+        can't be used, like the incomplete last line of a crash, are
+        skipped.
+        """
+        jobs = dict()
+        order = []
+        try:
+            with open(self.journal) as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                        if 'next_id' in entry:
+                            self._next_id = max(self._next_id, int(entry['next_id']))
+                        elif 'tokens' in entry:
+                            jobs[entry['id']] = entry
+                            order.append(entry['id'])
+                        elif entry['id'] in jobs:
+                            jobs[entry['id']]['status'] = entry['status']
+                    except (ValueError, TypeError, KeyError):
+                        continue
+        except OSError:
+            pass
+
+        for id_ in order:
+            entry = jobs[id_]
+            try:
+                self._next_id = max(self._next_id, int(id_) + 1)
+                if entry['status'] not in (QUEUED, DRAWING):
+                    continue
+                batch = entry.get('batch', False)
+                if batch:
+                    tokens = [_decode(tokens) for tokens in entry['tokens']]
+                else:
+                    tokens = _decode(entry['tokens'])
+                job = Job(int(id_), tokens, entry['lifted'], int(entry['priority']),
+                          batch=batch)
+            except (ValueError, TypeError, KeyError):
+                continue
+            self._insert(job)
+
+        self._compact()
+
+    def _insert(self, job):
+        """Inserts a job behind all jobs with the same or a higher priority"""
+        index = len(self._queue)
+        while index > 0 and self._queue[index - 1].priority < job.priority:
+            index -= 1
+        self._queue.insert(index, job)
+        self._jobs[job.id] = job
+
+    def _set_status(self, job, status):
+        job.status = status
+        self._write(({'id': job.id, 'status': status},))
+        if status in (DONE, CANCELLED, FAILED):
+            self._finished.append(job)
+            if len(self._finished) > KEEP_FINISHED:
+                del self._jobs[self._finished.pop(0).id]
+
+    def submit(self, tokens, lifted=False, priority=0, batch=False):
+        """Queues a drawing.
+
+        :param tokens: Tokens of the expression in RPN-Notation, the
+        body of a binary frame or the expression in infix-notation,
+        a list of them for a batch
+        :type tokens: list[str] | bytes | str | list
+        :param lifted: Whether the pen is lifted, defaults to False
+        :type lifted: bool, optional
+        :param priority: Jobs with a higher priority are drawn first,
+        defaults to 0
+        :type priority: int, optional
+        :param batch: tokens is a list of expressions, drawn in one
+        session, defaults to False
+        :type batch: bool, optional
+        :raises TypeError: priority is not an int
+        :return: Queued job
+        :rtype: Job
+        """
+        if not isinstance(priority, int):
+            # checked before the journal, it is compared when inserting
+            raise TypeError('priority must be an int')
+        job = Job(self._next_id, tokens, lifted, priority, batch=batch)
+        self._next_id += 1
+        self._write((job.to_dict(),))
+        self._insert(job)
+        return job
+
+    def pop(self):
+        """Takes the next job and marks it as drawing.
+
+        :return: Next job or None if the queue is empty
+        :rtype: Job | None
+        """
+        if not self._queue:
+            return None
+        job = self._queue.pop(0)
+        self._set_status(job, DRAWING)
+        self.current = job
+        return job
+
+    def finish(self, job, status=DONE, error=None):
+        """Marks a popped job as finished.
+
+        :param job: Job returned by pop
+        :type job: Job
+        :param status: DONE, CANCELLED or FAILED, defaults to DONE
+        :type status: str, optional
+        :param error: Reason of a failure, defaults to None
+        :type error: str, optional
+        """
+        job.error = error
+        self._set_status(job, status)
+        if self.current is job:
+            self.current = None
+        if not self._queue:
+            # nothing to recover, keep the journal small
+            self._compact()
+
+    def cancel(self, id_):
+        """Removes a queued job.
+
+        :param id_: Id of the job
+        :type id_: int
+        :return: True if the job was queued
+        :rtype: bool
+        """
+        job = self._jobs.get(id_)
+        if job is None or job.status != QUEUED:
+            return False
+        self._queue.remove(job)
+        self._set_status(job, CANCELLED)
+        return True
+
+    def get(self, id_):
+        """Returns the job with the id, if it is queued, drawing or
+        recently finished.
+
+        :rtype: Job | None
+        """
+        return self._jobs.get(id_)
+
+    def queued(self):
+        """Returns the ids of the queued jobs in drawing order
+
+        :rtype: list[int]
+        """
+        return [job.id for job in self._queue]
@@ -0,0 +1,117 @@
+"""
+Logging of the lego package, gated like the DEBUG and __debug__ checks
+of uasyncio: messages below level are dropped before formatting, and
+with micropython -O (__debug__ False) every call is a no-op.
+Hot loops check enabled once and skip the call completely.
+
+The binary trace records numbers of every segment into a preallocated
+buffer instead of printing, and is flushed after the motion ended.
+"""
+
+from array import array
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+
+# messages below level are dropped, DEBUG shows every motor command
+level = INFO
+
+# events of the trace
+SEGMENT = 1  # x- and y-speed in °/s
+MOVE = 2  # x- and y-angle in °
+CORRECTION = 3  # x- and y-position error in °
+
+# records kept by a trace
+TRACE_CAPACITY = 512
+
+
+def enabled(message_level):
+    """Returns True if messages of message_level are logged.
+
+    :param message_level: DEBUG, INFO, WARNING or ERROR
+    :type message_level: int
+    :rtype: bool
+    """
+    return __debug__ and message_level >= level
+
+
+def log(message_level, message, *args):
+    """Prints message, formatted with args, if message_level is enabled.
+
+    :param message_level: DEBUG, INFO, WARNING or ERROR
+    :type message_level: int
+    :param message: Message with {} for every arg
+    :type message: str
+    """
+    if __debug__ and message_level >= level:
+        print(_NAMES[message_level], message.format(*args) if args else message)
+
+
+def debug(message, *args):
+    log(DEBUG, message, *args)
+
+
+def info(message, *args):
+    log(INFO, message, *args)
+
+
+def warning(message, *args):
+    log(WARNING, message, *args)
+
+
+def error(message, *args):
+    log(ERROR, message, *args)
+
+
+class Trace:
+    """Binary trace of (event, a, b) records stored as float32. Records
+    beyond the capacity are counted but dropped.
+
+    :param capacity: Number of records, defaults to TRACE_CAPACITY
+    :type capacity: int, optional
+    """
+
+    def __init__(self, capacity=TRACE_CAPACITY):
+        self.capacity = capacity
+        self.records = array('f', [0.0]) * (3 * capacity)
+        self.count = 0
+
+    def record(self, event, a, b):
+        """Records an event without formatting or allocating.
+
+        :param event: Event, e.g. SEGMENT
+        :type event: int
+        """
+        if self.count < self.capacity:
+            index = 3 * self.count
+            self.records[index] = event
+            self.records[index + 1] = a
+            self.records[index + 2] = b
+        self.count += 1
+
+    def flush(self, stream=None):
+        """Writes the records and clears the trace. Call it after the
+        motion ended.
+
+        :param stream: Binary stream receiving the raw float32 records,
+        defaults to printing them
+        :type stream: io.BufferedWriter, optional
+        """
+        count = min(self.count, self.capacity)
+        if stream is not None:
+            stream.write(memoryview(self.records)[:3 * count])
+        else:
+            for index in range(0, 3 * count, 3):
+                print('TRACE', int(self.records[index]),
+                      self.records[index + 1], self.records[index + 2])
+        if self.count > count:
+            warning('Trace dropped {} records', self.count - count)
+        self.count = 0
+
+
+# trace of the motion, None disables it
+trace = None
@@ -3,311 +3,271 @@
 Main File that gets executed by the Lego Robot
 """
 import json
-import math
 
 from pybricks.ev3devices import Motor
 from pybricks.hubs import EV3Brick
 from pybricks.parameters import Direction, Port
-from pybricks.tools import wait as wait_time
 
+import jobs
+import logger
+import timing
 import uasyncio
-from calculus.expression import Expression
+from calculus import wire
+from calculus.exception import ParsingError
+from calculus.expression import Expression, limit_caches
+from plotter import Plotter
+
+# server: pending connections and polling interval of the idle worker in ms
+SERVER_BACKLOG = 4
+IDLE_INTERVAL = 100
+JOURNAL = 'jobs.journal'
+# minimum time between two progress messages of a stream in ms
+PROGRESS_INTERVAL = 250
+# record the timing of every phase of drawing
+TIMING = False
+# logger.DEBUG prints every motor command, slowing down drawing
+LOG_LEVEL = logger.INFO
+# record every segment into a binary trace, printed after drawing
+TRACE = False
+
+logger.level = LOG_LEVEL
+if TRACE:
+    logger.trace = logger.Trace()
 
-# in mm
-X_LENGTH = 127
-X_LEFT_BOUND = -X_LENGTH/2
-X_RIGHT_BOUND = X_LENGTH/2
-
-Y_LENGTH = 75
-Y_UPPER_BOUND = Y_LENGTH/2
-Y_LOWER_BOUND = -Y_LENGTH/2
-
-# in °/s
-X_MAX_ANGLE_SPEED = 360
-Y_MAX_ANGLE_SPEED = 180*3
-
-# in °
-ANGLE_TO_LIFT = 90
-
-
-def calculate_angle_ratio(diameter):
-    """Calculates the angle ratio for a given diameter, used
-    for translating turn angle of a gear to distance on a gear rack.
-    distance = degrees * angle ratio
-    angle = distance / angle ratio
-    Same for speeds.
-
-    :param diameter: Median diameter of the gear
-    :type diameter: float
-    :return: Angle Ratio used for calculations
-    :rtype: float
-    """
-    return diameter * math.pi * (1/360)
-
-
-SIXTEEN_TEETH_GEAR_DIAMETER = 16.3  # mm
-SIXTEEN_TEETH_ANGLE_RATIO = calculate_angle_ratio(SIXTEEN_TEETH_GEAR_DIAMETER)
-
-TWENTYFOUR_TEETH_GEAR_DIAMETER = 22.0
-TWENTYFOUR_TEETH_GEAR_ANGLE_RATIO = calculate_angle_ratio(
-    TWENTYFOUR_TEETH_GEAR_DIAMETER)
-
-angle_ratio = {
-    'x': SIXTEEN_TEETH_ANGLE_RATIO,
-    'y': TWENTYFOUR_TEETH_GEAR_ANGLE_RATIO
-}
 
+brick = EV3Brick()
 
-# somehow the precision alters the speed, so maybe resulting in bugs
-# if these bugs influences influence the real drawings, fuck a
-# new algorithm is needed
-PRECISION = 100  # intervals
+motor_x = Motor(Port.D, gears=[[24, 20], [16]])
+motor_y = Motor(Port.C, gears=[24],
+                positive_direction=Direction.COUNTERCLOCKWISE)
+# motor_z = Motor(Port.C)
 
 
-def find_start(expr):
-    """Finds the drawing starting point of a given expression
-    by iterating over the x length, respecting precision.
+plotter = Plotter(motor_x, motor_y, None,
+                  timer=timing.PhaseTimer() if TIMING else None)
+
+queue = jobs.JobQueue(JOURNAL)
+
+
+async def worker():
+    """Draws the queued jobs one after another"""
+    while True:
+        job = queue.pop()
+        if job is None:
+            await uasyncio.sleep_ms(IDLE_INTERVAL)
+            continue
+
+        status = jobs.FAILED
+        error = None
+        if plotter.timer is not None:
+            plotter.timer.clear()
+        limit_caches()
+        try:
+            exprs = [Expression(tokens) for tokens in job.expressions()]
+            for expr in exprs:
+                logger.info('Expression: {}', expr)
+            plotter.lifted = job.lifted
+            await plotter.draw_batch_async(exprs)
+            status = jobs.CANCELLED if plotter.cancelled else jobs.DONE
+        except Exception as err:
+            # the event loop stops on errors, keep serving the next jobs
+            plotter.stop()
+            error = describe(err)
+            logger.error('Job {} failed: {}', job.id, error)
+        finally:
+            plotter.progress = None
+            queue.finish(job, status, error)
+            if plotter.timer is not None:
+                logger.info('Timing (µs): {}', plotter.timer.summary())
+
+
+async def stream_progress(writer, job):
+    """Writes the state of a job as JSON lines until it is finished.
+    A line contains the status, and while drawing the progress, the
+    position in mm and the estimated remaining time in ms. Lines are
+    written at most every PROGRESS_INTERVAL ms and only if the state
+    changed. The motion loop never waits for the client.
 
-    :param expr: Expression to iterate over
-    :type expr: Expression
-    :return: tuple of (x, y) coordinates or None if no starting point
-    is found
-    :rtype: tuple[int, int] | None
+    :param writer: Writer-Stream
+    :type writer: StreamWriter
+    :param job: Job to report
+    :type job: jobs.Job
     """
-    x = X_LEFT_BOUND
-    while x < X_RIGHT_BOUND:
-        y = expr.evaluate(x)
-        if Y_LOWER_BOUND < y < Y_UPPER_BOUND:
-            return x, y
-        x += X_LENGTH / PRECISION
-    return None
-
-
-class Plotter:
-    """Class responsible for registering a drawing canvas."""
-
-    def __init__(self, motor_x, motor_y, motor_z, lifted=False):
-        self.motor_x = motor_x
-        self.motor_y = motor_y
-        self.motor_z = motor_z
-
-        self.current_x = X_LEFT_BOUND
-        self.current_y = Y_UPPER_BOUND
-
-        self.lifted = lifted
-
-        # self.move_to((X_RIGHT_BOUND, self.current_y))
-        # print('right top complete')
-        # wait_time(1000)
-        # self.move_to((self.current_x, Y_LOWER_BOUND))
-        # print('right bottom complete')
-        # wait_time(1000)
-        # self.move_to((X_LEFT_BOUND, self.current_y))
-        # print('left buttom complete')
-        # wait_time(1000)
-        # self.move_to((self.current_x, Y_UPPER_BOUND))
-        # print('left top complete')
-        # wait_time(1000)
-
-    def lift(self, wait=True):
-        """Lifts the pen if a z-motor is connected
-
-        :param wait: Wait for the maneuver to complete before continuing
-        with the rest of the program, defaults to True
-        :type wait: bool, optional
-        """
-        if not self.motor_z:
-            return
-        if self.lifted:
-            return
-
-        self.motor_z.run_angle(360, ANGLE_TO_LIFT, wait=wait)
-        self.lifted = True
-
-    def lower(self, wait=True):
-        """Lowers the pen if a z-motor is connected
-
-        :param wait: Wait for the maneuver to complete before continuing
-        with the rest of the program, defaults to True
-        :type wait: bool, optional
-        """
-        if not self.motor_z:
-            return
-        if not self.lifted:
+    last = None
+    while True:
+        answer = {'id': job.id, 'status': job.status}
+        if job.error is not None:
+            answer['error'] = job.error
+        if job is queue.current and plotter.progress is not None:
+            answer['progress'] = plotter.progress
+            answer['x'] = plotter.current_x
+            answer['y'] = plotter.current_y
+            answer['eta'] = plotter.remaining()
+
+        line = json.dumps(answer) + '\n'
+        if line != last:
+            await writer.awrite(line)
+            last = line
+        if job.status in (jobs.DONE, jobs.CANCELLED, jobs.FAILED):
             return
-
-        self.motor_z.run_angle(360, -ANGLE_TO_LIFT, wait=wait)
-        self.lifted = False
-
-    def move_to(self, coords, wait=True, parallel=False):
-        """Moves to given Coords and updates current values. Retains lifted status.
-
-        :param coords: Coords
-        :type coords: tuple[int, int]
-        :param wait: _description_, defaults to True
-        :type wait: bool, optional
-        :param parallel: Wait for the maneuver to complete before continuing
-        with the rest of the program, defaults to True
-        :type parallel: bool, optional
-        :raises ValueError: Values are out of bounds
-        """
-        x, y = coords
-        # same position, no movement needed
-        if x == self.current_x and y == self.current_y:
-            return
-
-        if not (X_LEFT_BOUND <= x <= X_RIGHT_BOUND or Y_LOWER_BOUND <= y <= Y_UPPER_BOUND):
-            raise ValueError('Values out of bounds')
-
-        angle_x = (x - self.current_x) / angle_ratio['x']
-        print('Angle X:', angle_x)
-        angle_y = (y - self.current_y) / angle_ratio['y']
-        print('Angle Y:', angle_y)
-
-        # make sure to lift before moving, but retain old lift status
-        was_lifted = self.lifted
-        if not self.lifted:
-            self.lift()
-
-        self.motor_x.run_angle(X_MAX_ANGLE_SPEED, angle_x, wait=not parallel)
-        self.motor_y.run_angle(Y_MAX_ANGLE_SPEED, angle_y, wait=wait)
-
-        if not was_lifted:
-            self.lower()
-
-        self.current_x = x
-        self.current_y = y
+        await uasyncio.sleep_ms(PROGRESS_INTERVAL)
 
 
-    def draw(self, expr):
-        """Main Logic. Draws the function on the paper.
-        First moves the pen to the visible start of the function.
-        Starts the x-motor, calculates speed of y-motor with help of
-        the first derivative. If pen exceeds borders, stop y-motor.
-        Adjust x-speed if y-speeds exceeds the maximum to retain x to y
-        ratio. Calculate the time it should spent with help of the
-        variation of the x speeds and the average x-speed and wait.
+def describe(err):
+    """Describes an error for the client and the log
 
-        :param expr: Expression to draw
-        :type expr: Expression
-        :yield: Progress of drawing. Ranging from 0 - 1.
-        :rtype: float
-        """
-        # first derivative
-        f_prime = expr.diff()
-
-        self.lift()
-
-        # calculate timings
-        x_speed = (X_MAX_ANGLE_SPEED * angle_ratio['x'])
-        total_time = X_LENGTH / x_speed  # t = s / v
-        average_time = total_time / PRECISION
-
-        self.move_to(find_start(expr))
-
-        
-
-        # draw loop
-        time_spent = 0
-        while self.current_x < X_RIGHT_BOUND:
-            wait_time(time_spent * 1000)
-            x_angle_speed = X_MAX_ANGLE_SPEED
-            # self.motor_x.run(x_angle_speed)
-
-            # stop y-motor if pen is not in bounds
-            if not Y_LOWER_BOUND < expr.evaluate(self.current_x) < Y_UPPER_BOUND:
-                y_speed = 0.0
-            else:
-                y_speed = f_prime.evaluate(self.current_x) 
-            y_angle_speed = y_speed * x_angle_speed
-
-            # speed factor is the ratio of y to y_max
-            speed_factor = 1.0
-            # if y-speed exceeds, slow down x-motor to retain ratio
-            if abs(y_angle_speed) > Y_MAX_ANGLE_SPEED:
-                speed_factor = abs(y_angle_speed / Y_MAX_ANGLE_SPEED)
-                # respect orientation
-                y_angle_speed = math.copysign(Y_MAX_ANGLE_SPEED, y_speed)
-                x_angle_speed /= speed_factor
-
-            print('X-Speed: ', x_angle_speed) # * angle_ratio['x'])
-            print('Y-Speed: ', y_angle_speed) # * angle_ratio['y'])
-
-
-            self.motor_x.run(x_angle_speed)
-            self.motor_y.run(y_angle_speed)
-
-            # average time multiplied with speed factor
-            # gives the actual time for the current speeds
-            time_spent = average_time * speed_factor
-
-            # needed for loop
-            # s = v · t
-            self.current_x += (x_angle_speed * angle_ratio['x']) * time_spent
-            self.current_y += (y_angle_speed * angle_ratio['y']) * time_spent
-
-            percentage = (self.current_x + X_LENGTH / 2) / X_LENGTH
-            yield percentage
-
-            # adjust for ms
-            
-
-        self.motor_x.hold()
-        self.motor_y.hold()
-
-        print(1, self.current_x)
-        wait_time(5000)
-
-        self.move_to((X_LEFT_BOUND, Y_UPPER_BOUND))
-        print(2, self.current_x)
+    :rtype: str
+    """
+    message = str(err)
+    if not message:
+        return type(err).__name__
+    return '{}: {}'.format(type(err).__name__, message)
+
+
+def check(tokens):
+    """Parses an expression and compiles it with the derivatives the
+    plotter needs, so invalid jobs are rejected before they are queued.
+    The parsed expression stays cached for the worker.
+
+    :param tokens: Tokens like in a draw request
+    :type tokens: list[str] | bytes | str
+    :raises ParsingError: Input is not a correct expression
+    :raises ArithmeticError: Constant part can't be evaluated, e.g. x/0
+    :raises ValueError: Constant part is out of a domain, e.g. ln(0)
+    """
+    # trees are only used without yielding to the event loop, by the
+    # worker before drawing and here, so none is in use now
+    limit_caches()
+    expr = Expression(tokens)
+    for order in range(3):
+        expr.derivative(order).compile()
 
 
-brick = EV3Brick()
+async def read_frame(reader, first):
+    """Reads a binary draw request (calculus.wire), its body is queued
+    as it is and decoded when drawing. Batches are split into the
+    bodies of their expressions.
 
-motor_x = Motor(Port.D, gears=[[24, 20], [16]])
-motor_y = Motor(Port.C, gears=[24],
-                positive_direction=Direction.COUNTERCLOCKWISE)
-# motor_z = Motor(Port.C)
+    :param reader: Reader-Stream
+    :type reader: StreamReader
+    :param first: First byte, already read
+    :type first: bytes
+    :raises ParsingError: Frame is incomplete or of another version
+    :return: Request like a JSON draw request
+    :rtype: dict
+    """
+    header = first + await reader.readexactly(wire.HEADER_SIZE - 1)
+    lifted, stream, batch, priority, length = wire.decode_header(header)
+    body = await reader.readexactly(length)
+    if len(body) != length:
+        raise ParsingError('Incomplete frame')
+    request = {'lifted': lifted, 'priority': priority, 'stream': stream}
+    if batch:
+        request['batch'] = wire.split_batch(body)
+    else:
+        request['tokens'] = body
+    return request
 
 
 async def print_callback(reader, writer):
-    """Gets executed everytime the TCP-Server receives a connection
+    """Gets executed everytime the TCP-Server receives a connection.
+    Reads one JSON request or binary frame (calculus.wire) per
+    connection. Requests without a command queue a drawing of their
+    'tokens' or infix 'expression' with an optional priority and return
+    its id. A 'batch' of several tokens or expressions is planned
+    together and drawn as one job, homing only once.
+    The command 'status' reports the state of a job or of the queue,
+    'cancel' removes a queued job or stops the running drawing,
+    'timing' returns the phase timings of the current or last job.
+    Returns immediately, drawing happens in the worker. Draw requests
+    with 'stream' set keep the connection open and receive the progress.
 
     :param reader: Reader-Stream
     :type reader: StreamReader
     :param writer: Writer-Stream
     :type writer: StreamWriter
     """
-    print('Connected with:', writer.get_extra_info('peername'))
-    res = await reader.readline()
+    logger.info('Connected with: {}', writer.get_extra_info('peername'))
+    first = await reader.read(1)
 
     try:
-        response = json.loads((res.decode('ascii')))
-    except json.JSONDecodeError as err:
-        print('no json')
-        reader.aclose()
+        if first and first[0] == wire.MAGIC:
+            response = await read_frame(reader, first)
+        else:
+            res = first + await reader.readline()
+            response = json.loads((res.decode('ascii')))
+    except (ValueError, ParsingError) as err:
+        logger.warning('no json or frame: {}', err)
+        await writer.aclose()
         return err
-
-    print('tokens: ', response['tokens'])
-    expr = Expression(response['tokens'])
-    lifted = response['lifted']
-    print('Expression: ', expr)
-
-    plotter = Plotter(motor_x, motor_y, None, lifted=lifted)
-    
-    for percentage in plotter.draw(expr):
-        # print(percentage)
-        pass
-
-    reader.aclose()
+    if not isinstance(response, dict):
+        logger.warning('no json object: {}', response)
+        await writer.awrite(json.dumps({'error': 'Request is no JSON object'}) + '\n')
+        await writer.aclose()
+        return
+
+    command = response.get('command', 'draw')
+    id_ = response.get('id')
+    current = queue.current
+    if command == 'status' and id_ is not None:
+        job = queue.get(id_)
+        answer = {'id': id_, 'status': job.status if job else None}
+        if job is not None and job is current:
+            answer['progress'] = plotter.progress
+        if job is not None and job.error is not None:
+            answer['error'] = job.error
+    elif command == 'status':
+        answer = {
+            'drawing': current.id if current else None,
+            'progress': plotter.progress,
+            'queued': queue.queued()
+        }
+    elif command == 'timing':
+        answer = {'timing': plotter.timer.summary() if plotter.timer else None}
+    elif command == 'cancel':
+        if current is not None and id_ in (None, current.id):
+            plotter.cancel()
+            cancelled = True
+        else:
+            cancelled = queue.cancel(id_)
+        answer = {'id': id_, 'cancelled': cancelled}
+    else:
+        batch = response.get('batch')
+        tokens = batch or response.get('tokens') or response.get('expression')
+        logger.debug('tokens: {}', tokens)
+        try:
+            priority = int(response.get('priority', 0))
+            if batch is not None and not batch:
+                raise ValueError('Empty batch')
+            if not tokens:
+                raise ValueError('No expression to draw')
+            for expression in (batch or (tokens,)):
+                check(expression)
+        except Exception as err:
+            job = None
+            answer = {'error': describe(err)}
+            logger.warning('rejected {}', answer['error'])
+        else:
+            job = queue.submit(
+                tokens, response.get('lifted', False), priority, bool(batch))
+            answer = {'id': job.id, 'queued': len(queue)}
+
+    await writer.awrite(json.dumps(answer) + '\n')
+    if command == 'draw' and job is not None and response.get('stream'):
+        try:
+            await stream_progress(writer, job)
+        except OSError:
+            logger.info('client disconnected')
+    await writer.aclose()
 
 
 async def main():
-    """Starts server"""
-    print('Started Server')
-    server = await uasyncio.start_server(print_callback, '0.0.0.0', 64010, 1)
+    """Starts the worker and the server"""
+    logger.info('Started Server')
+    uasyncio.get_event_loop().create_task(worker())
+    server = await uasyncio.start_server(print_callback, '0.0.0.0', 64010, SERVER_BACKLOG)
     await server.wait_closed()
-    print('Closed Server')
+    logger.info('Closed Server')
 
 
 def debug():
@@ -0,0 +1,636 @@
+"""
+Motion planning for the plotter. Independent of the motors, so it can
+run on the brick as well as on a host.
+"""
+
+import math
+import sys
+from array import array
+
+try:
+    import struct
+except ImportError:
+    import ustruct as struct
+
+# plan files: magic, version, start and end x and y in mm, duration in
+# ms and number of segments, followed by the segments as float32
+PLAN_MAGIC = b'HKPL'
+PLAN_VERSION = 2
+PLAN_HEADER = '<4sB3xdddddI'
+PLAN_HEADER_SIZE = struct.calcsize(PLAN_HEADER)
+SEGMENT_SIZE = 12
+# segments read at once while streaming a plan file
+CHUNK = 64
+
+
+def _evaluate(f, x):
+    """Evaluates f, returning None where it is not defined or not real,
+    like fractional powers of negative numbers.
+    """
+    try:
+        y = f(x)
+    except (ValueError, ZeroDivisionError, OverflowError):
+        return None
+    if isinstance(y, complex):
+        return None
+    return y
+
+
+def adaptive_step(slope, curvature, tolerance, min_step, max_step):
+    """Calculates the x-step for which the chord between two points of
+    the curve deviates at most tolerance from the curve.
+    A chord of length l on a circle with curvature k deviates about
+    k * l^2 / 8, so l = sqrt(8 * tolerance / k).
+
+    :param slope: First derivative at the current point
+    :type slope: float | None
+    :param curvature: Second derivative at the current point
+    :type curvature: float | None
+    :param tolerance: Maximum chord error in mm
+    :type tolerance: float
+    :param min_step: Minimum step in mm
+    :type min_step: float
+    :param max_step: Maximum step in mm
+    :type max_step: float
+    :return: Step in x-direction
+    :rtype: float
+    """
+    if slope is None or curvature is None:
+        return min_step
+
+    stretch = math.sqrt(1 + slope * slope)
+    # curvature of the graph of a function
+    kappa = abs(curvature) / (stretch * stretch * stretch)
+    if kappa == 0:
+        return max_step
+
+    step = math.sqrt(8 * tolerance / kappa) / stretch
+    return min(max(step, min_step), max_step)
+
+
+def chord_error(f, x, y, step):
+    """Distance of the curve to the chord from (x, y) to x + step,
+    measured at the middle of the chord.
+
+    :return: Chord error in mm, None if f is not defined
+    :rtype: float | None
+    """
+    end_y = _evaluate(f, x + step)
+    middle_y = _evaluate(f, x + step / 2)
+    if y is None or end_y is None or middle_y is None:
+        return None
+    rise = end_y - y
+    # vertical distance projected onto the normal of the chord
+    return abs(middle_y - (y + end_y) / 2) * step / math.sqrt(step * step + rise * rise)
+
+
+def adaptive_samples(f, f_prime, f_second, start, end, tolerance,
+                     min_step, max_step):
+    """Samples the curve from start to end with steps adapted to the
+    local curvature: straight stretches get few points, tight curves
+    many. Steps are halved until the chord error is below tolerance,
+    as the curvature can change within a step, e.g. after an
+    inflection point.
+
+    :param f: Function
+    :type f: Callable[[float], float]
+    :param f_prime: First derivative
+    :type f_prime: Callable[[float], float]
+    :param f_second: Second derivative
+    :type f_second: Callable[[float], float]
+    :param start: First x
+    :type start: float
+    :param end: Last x
+    :type end: float
+    :param tolerance: Maximum chord error in mm
+    :type tolerance: float
+    :param min_step: Minimum step in mm
+    :type min_step: float
+    :param max_step: Maximum step in mm
+    :type max_step: float
+    :return: Points (x, y), y is None where f is not defined
+    :rtype: list[tuple[float, float | None]]
+    """
+    points = []
+    x = start
+    while x < end:
+        y = _evaluate(f, x)
+        points.append((x, y))
+        step = adaptive_step(
+            _evaluate(f_prime, x), _evaluate(f_second, x),
+            tolerance, min_step, max_step)
+        step = min(step, end - x)
+        while step > min_step:
+            error = chord_error(f, x, y, step)
+            if error is not None and error <= tolerance:
+                break
+            step = max(step / 2, min_step)
+        x += step
+    points.append((end, _evaluate(f, end)))
+    return points
+
+
+class Plan:
+    """Precomputed motion of a stroke, drawn without lifting the pen.
+    Segments are stored flat in an array as (duration_ms, x_speed, y_speed)
+    with speeds in °/s, so a plan costs 12 bytes per segment.
+    """
+
+    def __init__(self, start, segments=None, end=None):
+        self.start = start
+        self.segments = segments if segments is not None else array('f')
+        # position after the last segment, kept by plan_motion
+        self.end = end if end is not None else start
+
+    def append(self, duration, x_speed, y_speed):
+        """Appends a segment.
+
+        :param duration: Duration in ms
+        :type duration: float
+        :param x_speed: Speed of the x-motor in °/s
+        :type x_speed: float
+        :param y_speed: Speed of the y-motor in °/s
+        :type y_speed: float
+        """
+        self.segments.append(duration)
+        self.segments.append(x_speed)
+        self.segments.append(y_speed)
+
+    def __len__(self):
+        return len(self.segments) // 3
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('segment index out of range')
+        segments = self.segments
+        return segments[3 * index], segments[3 * index + 1], segments[3 * index + 2]
+
+    def __iter__(self):
+        segments = self.segments
+        for index in range(0, len(segments), 3):
+            yield segments[index], segments[index + 1], segments[index + 2]
+
+    def duration(self):
+        """Returns the total duration in ms"""
+        return sum(self.segments[index] for index in range(0, len(self.segments), 3))
+
+    def reversed(self):
+        """Returns the plan drawing the same path backwards, from end to
+        start. The acceleration limits hold in both directions.
+
+        :rtype: Plan
+        """
+        segments = self.segments
+        count = len(segments)
+        result = array('f', [0.0]) * count
+        for index in range(0, count, 3):
+            target = count - 3 - index
+            result[target] = segments[index]
+            result[target + 1] = -segments[index + 1]
+            result[target + 2] = -segments[index + 2]
+        return Plan(self.end, result, self.start)
+
+
+def _little_endian(segments):
+    """Segments in the byte order of plan files, the brick is little endian"""
+    if sys.byteorder == 'big':
+        segments = array('f', segments)
+        segments.byteswap()
+    return segments
+
+
+def save_plan(plan, path):
+    """Writes a plan to a file, e.g. to plan on a host and replay it
+    on the brick without any calculations.
+
+    :param plan: Plan to write
+    :type plan: Plan
+    :param path: Path of the plan file
+    :type path: str
+    """
+    with open(path, 'wb') as file:
+        file.write(struct.pack(
+            PLAN_HEADER, PLAN_MAGIC, PLAN_VERSION, plan.start[0], plan.start[1],
+            plan.end[0], plan.end[1], plan.duration(), len(plan)))
+        file.write(_little_endian(plan.segments))
+
+
+def _read_header(file):
+    """Reads the header of a plan file.
+
+    :raises ValueError: Not a plan file or of another version
+    :return: start, end, duration and number of segments
+    :rtype: tuple[tuple[float, float], tuple[float, float], float, int]
+    """
+    header = file.read(PLAN_HEADER_SIZE)
+    if len(header) < PLAN_HEADER_SIZE:
+        raise ValueError('Incomplete plan file')
+    magic, version, x, y, end_x, end_y, duration, count = struct.unpack(PLAN_HEADER, header)
+    if magic != PLAN_MAGIC or version != PLAN_VERSION:
+        raise ValueError('Not a plan file of version {}'.format(PLAN_VERSION))
+    return (x, y), (end_x, end_y), duration, count
+
+
+def load_plan(path):
+    """Reads a whole plan file into memory.
+
+    :param path: Path of the plan file
+    :type path: str
+    :raises ValueError: Not a plan file or of another version
+    :return: Plan
+    :rtype: Plan
+    """
+    with open(path, 'rb') as file:
+        start, end, _, count = _read_header(file)
+        segments = array('f', [0.0]) * (3 * count)
+        if file.readinto(segments) != count * SEGMENT_SIZE:
+            raise ValueError('Incomplete plan file')
+    return Plan(start, _little_endian(segments), end)
+
+
+class PlanFile:
+    """Plan streamed from a file in chunks of CHUNK segments, so long
+    plans don't have to fit into memory. Can be executed like a Plan.
+
+    :param path: Path of the plan file
+    :type path: str
+    :raises ValueError: Not a plan file or of another version
+    """
+
+    def __init__(self, path, chunk=CHUNK):
+        self.path = path
+        self.chunk = chunk
+        with open(path, 'rb') as file:
+            self.start, self.end, self._duration, self._count = _read_header(file)
+
+    def __len__(self):
+        return self._count
+
+    def duration(self):
+        """Returns the total duration in ms"""
+        return self._duration
+
+    def __iter__(self):
+        # one buffer for all chunks
+        buffer = array('f', [0.0]) * (3 * self.chunk)
+        with open(self.path, 'rb') as file:
+            file.read(PLAN_HEADER_SIZE)
+            while True:
+                size = file.readinto(buffer)
+                if not size:
+                    return
+                segments = _little_endian(buffer)
+                for index in range(0, size // 4 - 2, 3):
+                    yield segments[index], segments[index + 1], segments[index + 2]
+
+
+def plan_motion(points, angle_ratio, max_speed, y_bounds):
+    """Converts sampled points into a Plan. Every chord between two points
+    becomes a segment, driven with the slower axis at its maximum speed.
+    Points outside of the y bounds or where the function is not defined
+    stop the y-motor.
+
+    :param points: Points (x, y) in mm, y may be None
+    :type points: list[tuple[float, float | None]]
+    :param angle_ratio: mm per ° of the x- and y-motor
+    :type angle_ratio: tuple[float, float]
+    :param max_speed: Maximum speeds of the x- and y-motor in °/s
+    :type max_speed: tuple[float, float]
+    :param y_bounds: Lower and upper bound of y in mm
+    :type y_bounds: tuple[float, float]
+    :return: Plan starting at the first point
+    :rtype: Plan
+    """
+    y_lower, y_upper = y_bounds
+    current_x, current_y = points[0]
+    if current_y is None:
+        current_y = y_upper
+    current_y = min(max(current_y, y_lower), y_upper)
+    plan = Plan((current_x, current_y))
+
+    for x, y in points[1:]:
+        if y is None:
+            y = current_y
+        y = min(max(y, y_lower), y_upper)
+
+        x_angle = (x - current_x) / angle_ratio[0]
+        y_angle = (y - current_y) / angle_ratio[1]
+
+        # time needed with the x-motor at full speed, longer
+        # if the y-motor would exceed its maximum speed
+        time_spent = max(abs(x_angle) / max_speed[0],
+                         abs(y_angle) / max_speed[1])
+        if time_spent == 0:
+            continue
+
+        plan.append(time_spent * 1000, x_angle / time_spent, y_angle / time_spent)
+        current_x = x
+        current_y = y
+    plan.end = (current_x, current_y)
+    return plan
+
+
+def split_strokes(f, points, y_bounds, tolerance):
+    """Splits sampled points into strokes, the runs of points where the
+    curve is visible, so the pen can be lifted across the gaps instead of
+    drawing along the border. A stroke also ends where the middle between
+    two visible points isn't, e.g. at the pole of 1/x. Where the curve
+    leaves or enters the canvas, the edge is bisected down to tolerance,
+    so strokes reach the border.
+
+    :param f: Function
+    :type f: Callable[[float], float]
+    :param points: Points (x, y) in mm, y is None where f is not defined
+    :type points: list[tuple[float, float | None]]
+    :param y_bounds: Lower and upper bound of y in mm
+    :type y_bounds: tuple[float, float]
+    :param tolerance: Precision of the edges in mm
+    :type tolerance: float
+    :return: Strokes of at least two points
+    :rtype: list[list[tuple[float, float]]]
+    """
+    y_lower, y_upper = y_bounds
+
+    def visible(y):
+        return y is not None and y_lower <= y <= y_upper
+
+    def edge(inside, outside):
+        while abs(outside - inside) > tolerance:
+            middle = (inside + outside) / 2
+            if visible(_evaluate(f, middle)):
+                inside = middle
+            else:
+                outside = middle
+        return inside, f(inside)
+
+    strokes = []
+    stroke = None
+    previous = None
+    for x, y in points:
+        if not visible(y):
+            if stroke is not None:
+                stroke.append(edge(previous, x))
+                strokes.append(stroke)
+                stroke = None
+            previous = x
+            continue
+
+        if stroke is not None:
+            middle = (previous + x) / 2
+            if not visible(_evaluate(f, middle)):
+                stroke.append(edge(previous, middle))
+                strokes.append(stroke)
+                stroke = None
+                previous = middle
+
+        if stroke is None:
+            stroke = [] if previous is None else [edge(x, previous)]
+        stroke.append((x, y))
+        previous = x
+    if stroke is not None:
+        strokes.append(stroke)
+    return [stroke for stroke in strokes if len(stroke) > 1]
+
+
+def travel(start, end, speed):
+    """Time of a pen-up move, both motors run at once.
+
+    :param start: Position (x, y) in mm
+    :type start: tuple[float, float]
+    :param end: Position (x, y) in mm
+    :type end: tuple[float, float]
+    :param speed: Speeds of the x- and y-axis in mm/s
+    :type speed: tuple[float, float]
+    :return: Time in s
+    :rtype: float
+    """
+    return max(abs(end[0] - start[0]) / speed[0], abs(end[1] - start[1]) / speed[1])
+
+
+def _on_border(point, bounds):
+    """Returns the nearest point on the border of the canvas and its
+    distance along the border, counterclockwise from the lower left
+    corner.
+    """
+    x_lower, x_upper, y_lower, y_upper = bounds
+    width = x_upper - x_lower
+    height = y_upper - y_lower
+    x = min(max(point[0], x_lower), x_upper)
+    y = min(max(point[1], y_lower), y_upper)
+    nearest = min(y - y_lower, x_upper - x, y_upper - y, x - x_lower)
+    if nearest == y - y_lower:
+        return (x, y_lower), x - x_lower
+    if nearest == x_upper - x:
+        return (x_upper, y), width + y - y_lower
+    if nearest == y_upper - y:
+        return (x, y_upper), width + height + x_upper - x
+    return (x_lower, y), 2 * width + height + y_upper - y
+
+
+def border_route(start, end, bounds):
+    """Route of a pen-down move along the border of the canvas, taking
+    the shorter way around. Points inside the canvas are connected to
+    the nearest edge first, but the ends of strokes drawn without lifting
+    the pen mostly lie on the border already.
+
+    :param start: Position (x, y) in mm
+    :type start: tuple[float, float]
+    :param end: Position (x, y) in mm
+    :type end: tuple[float, float]
+    :param bounds: Lower and upper x bound, lower and upper y bound in mm
+    :type bounds: tuple[float, float, float, float]
+    :return: Points to move to one after another, ending with end
+    :rtype: list[tuple[float, float]]
+    """
+    x_lower, x_upper, y_lower, y_upper = bounds
+    width = x_upper - x_lower
+    height = y_upper - y_lower
+    perimeter = 2 * (width + height)
+    corners = (
+        (0, (x_lower, y_lower)),
+        (width, (x_upper, y_lower)),
+        (width + height, (x_upper, y_upper)),
+        (2 * width + height, (x_lower, y_upper))
+    )
+
+    first, position = _on_border(start, bounds)
+    last, target = _on_border(end, bounds)
+    forward = (target - position) % perimeter
+    if forward <= perimeter / 2:
+        passed = [((corner - position) % perimeter, point) for corner, point in corners]
+        distance = forward
+    else:
+        passed = [((position - corner) % perimeter, point) for corner, point in corners]
+        distance = perimeter - forward
+    passed = sorted(item for item in passed if 0 < item[0] < distance)
+
+    route = [first]
+    route.extend(point for _, point in passed)
+    route.extend((last, end))
+    return route
+
+
+def order_plans(plans, position, speed, passes=4):
+    """Orders and orients strokes to shorten the pen-up travel between
+    them. Starting at position, the stroke with the nearest end is drawn
+    next, reversed if its end is nearer than its start. 2-opt then
+    reverses runs of strokes while that shortens the travel.
+
+    :param plans: Strokes of one or several functions
+    :type plans: list[Plan]
+    :param position: Position (x, y) of the pen in mm
+    :type position: tuple[float, float]
+    :param speed: Speeds of the x- and y-axis in mm/s
+    :type speed: tuple[float, float]
+    :param passes: Maximum number of 2-opt passes, defaults to 4
+    :type passes: int, optional
+    :return: Strokes in drawing order
+    :rtype: list[Plan]
+    """
+    remaining = list(plans)
+    ordered = []
+    current = position
+    while remaining:
+        best = best_index = best_reversed = None
+        for index, plan in enumerate(remaining):
+            for reverse, point in ((False, plan.start), (True, plan.end)):
+                time_spent = travel(current, point, speed)
+                if best is None or time_spent < best:
+                    best, best_index, best_reversed = time_spent, index, reverse
+        plan = remaining.pop(best_index)
+        if best_reversed:
+            plan = plan.reversed()
+        ordered.append(plan)
+        current = plan.end
+
+    count = len(ordered)
+    for _ in range(passes):
+        changed = False
+        for first in range(count):
+            before = position if first == 0 else ordered[first - 1].end
+            for last in range(first, count):
+                after = ordered[last + 1].start if last + 1 < count else None
+                old = travel(before, ordered[first].start, speed)
+                new = travel(before, ordered[last].end, speed)
+                if after is not None:
+                    old += travel(ordered[last].end, after, speed)
+                    new += travel(ordered[first].start, after, speed)
+                if new < old:
+                    ordered[first:last + 1] = [
+                        plan.reversed() for plan in reversed(ordered[first:last + 1])]
+                    changed = True
+        if not changed:
+            break
+    return ordered
+
+
+def _max_scale(scale, speed, neighbour, change):
+    """Largest factor up to scale, for which scale * speed differs at most
+    change from the speed of the neighbouring segment. If the motor
+    reverses, the speed ramps through 0 like a trapezoid: the neighbouring
+    segment ramps down to 0 itself, so the speed only has to start from 0.
+    """
+    if speed == 0:
+        return scale
+    if neighbour * speed < 0:
+        neighbour = 0.0
+    return min(scale, (neighbour + math.copysign(change, speed)) / speed)
+
+
+def limit_acceleration(plan, max_acceleration, min_scale=0.05, passes=4):
+    """Slows segments down, so no motor has to change its speed faster than
+    its acceleration limit, similar to the planners of 3D-printer firmware.
+    Each segment keeps its path, its speeds are scaled by a common factor
+    and its duration by the inverse. A backward pass looks ahead and
+    slows down before steep sections and the final stop, a forward pass
+    limits the acceleration from the previous segment and the start.
+    Both are repeated until nothing changes.
+
+    :param plan: Plan to limit
+    :type plan: Plan
+    :param max_acceleration: Maximum acceleration of the x- and y-motor in °/s²
+    :type max_acceleration: tuple[float, float]
+    :param min_scale: Lowest factor of a segment's speeds, defaults to 0.05
+    :type min_scale: float, optional
+    :param passes: Maximum number of backward and forward passes, defaults to 4
+    :type passes: int, optional
+    :return: Plan with limited acceleration
+    :rtype: Plan
+    """
+    count = len(plan)
+    scales = [1.0] * count
+    x_acceleration = max_acceleration[0] / 1000
+    y_acceleration = max_acceleration[1] / 1000
+
+    def limit(index, x_neighbour, y_neighbour):
+        duration, x_speed, y_speed = plan[index]
+        scale = min(
+            _max_scale(scales[index], x_speed, x_neighbour, x_acceleration * duration),
+            _max_scale(scales[index], y_speed, y_neighbour, y_acceleration * duration)
+        )
+        scale = max(scale, min_scale)
+        changed = scale < scales[index]
+        scales[index] = min(scale, scales[index])
+        return changed, scales[index] * x_speed, scales[index] * y_speed
+
+    for _ in range(passes):
+        changed = False
+
+        # backward, ending at rest
+        x_neighbour = y_neighbour = 0.0
+        for index in range(count - 1, -1, -1):
+            limited, x_neighbour, y_neighbour = limit(index, x_neighbour, y_neighbour)
+            changed = changed or limited
+
+        # forward, starting at rest
+        x_neighbour = y_neighbour = 0.0
+        for index in range(count):
+            limited, x_neighbour, y_neighbour = limit(index, x_neighbour, y_neighbour)
+            changed = changed or limited
+
+        if not changed:
+            break
+
+    result = Plan(plan.start, end=plan.end)
+    for scale, (duration, x_speed, y_speed) in zip(scales, plan):
+        result.append(duration / scale, x_speed * scale, y_speed * scale)
+    return result
+
+
+class Telemetry:
+    """Errors measured by a closed-loop execution, per axis in ° and °/s.
+    Position errors are planned minus measured motor angles, speed errors
+    commanded minus measured motor speeds.
+    """
+
+    def __init__(self):
+        self.samples = 0
+        self.position_error = [0.0, 0.0]
+        self.max_position_error = [0.0, 0.0]
+        self.speed_error = [0.0, 0.0]
+        self._squared_position_error = [0.0, 0.0]
+
+    def record(self, position_error, speed_error):
+        """Records a sample.
+
+        :param position_error: Position error of the x- and y-motor in °
+        :type position_error: tuple[float, float]
+        :param speed_error: Speed error of the x- and y-motor in °/s
+        :type speed_error: tuple[float, float]
+        """
+        self.samples += 1
+        for axis in (0, 1):
+            error = position_error[axis]
+            self.position_error[axis] = error
+            self.speed_error[axis] = speed_error[axis]
+            self.max_position_error[axis] = max(self.max_position_error[axis], abs(error))
+            self._squared_position_error[axis] += error * error
+
+    def rms_position_error(self):
+        """Returns the root mean square of the position errors per axis in °"""
+        if not self.samples:
+            return 0.0, 0.0
+        return tuple(math.sqrt(squared / self.samples)
+                     for squared in self._squared_position_error)
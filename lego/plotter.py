@@ -0,0 +1,717 @@
+"""
+Plotter driving the motors, independent of the server. Motors and clock
+are passed in, so it runs on the brick with pybricks as well as on a
+host with the simulation.
+"""
+import math
+
+try:
+    from pybricks.tools import StopWatch
+    from pybricks.tools import wait as wait_time
+except ImportError:
+    StopWatch = wait_time = None
+
+try:
+    from utime import ticks_add, ticks_diff, ticks_ms
+except ImportError:
+    ticks_add = ticks_diff = ticks_ms = None
+
+try:
+    import uasyncio
+except ImportError:
+    uasyncio = None
+
+import logger
+import motion
+import timing
+
+# in mm
+X_LENGTH = 127
+X_LEFT_BOUND = -X_LENGTH/2
+X_RIGHT_BOUND = X_LENGTH/2
+
+Y_LENGTH = 75
+Y_UPPER_BOUND = Y_LENGTH/2
+Y_LOWER_BOUND = -Y_LENGTH/2
+
+# in °/s
+X_MAX_ANGLE_SPEED = 360
+Y_MAX_ANGLE_SPEED = 180*3
+
+# in mm/s², converted to °/s² with the angle ratio
+X_MAX_ACCELERATION = 600
+Y_MAX_ACCELERATION = 600
+
+# in °
+ANGLE_TO_LIFT = 90
+# time to lift or lower the pen in ms
+LIFT_TIME = 400
+
+# closed-loop execution: sampling interval of the motor angles in ms and
+# share of the position error corrected within one interval
+CLOSED_LOOP = False
+CONTROL_INTERVAL = 20
+CORRECTION_GAIN = 0.5
+
+
+
+def calculate_angle_ratio(diameter):
+    """Calculates the angle ratio for a given diameter, used
+    for translating turn angle of a gear to distance on a gear rack.
+    distance = degrees * angle ratio
+    angle = distance / angle ratio
+    Same for speeds.
+
+    :param diameter: Median diameter of the gear
+    :type diameter: float
+    :return: Angle Ratio used for calculations
+    :rtype: float
+    """
+    return diameter * math.pi * (1/360)
+
+
+SIXTEEN_TEETH_GEAR_DIAMETER = 16.3  # mm
+SIXTEEN_TEETH_ANGLE_RATIO = calculate_angle_ratio(SIXTEEN_TEETH_GEAR_DIAMETER)
+
+TWENTYFOUR_TEETH_GEAR_DIAMETER = 22.0
+TWENTYFOUR_TEETH_GEAR_ANGLE_RATIO = calculate_angle_ratio(
+    TWENTYFOUR_TEETH_GEAR_DIAMETER)
+
+angle_ratio = {
+    'x': SIXTEEN_TEETH_ANGLE_RATIO,
+    'y': TWENTYFOUR_TEETH_GEAR_ANGLE_RATIO
+}
+
+# in °/s²
+max_angle_acceleration = (
+    X_MAX_ACCELERATION / angle_ratio['x'],
+    Y_MAX_ACCELERATION / angle_ratio['y']
+)
+
+
+# resolution used to search for the visible ranges of the curve
+PRECISION = 100  # intervals
+# precision of the points where the curve leaves the canvas (in mm)
+EDGE_TOLERANCE = 0.05
+
+# sampling of the curve, steps adapt to the curvature (in mm)
+CHORD_TOLERANCE = 0.2
+MIN_STEP = 0.2
+MAX_STEP = X_LENGTH / 8
+
+
+class Clock:
+    """Time of the brick, using pybricks.tools. The Plotter only uses
+    time, wait, sleep and the deadlines, so a simulation can replace it.
+    Motions wait until deadlines relative to their start instead of
+    waiting durations, so the time spent between waits doesn't add up.
+    """
+
+    def __init__(self):
+        self.watch = StopWatch()
+
+    def time(self):
+        """Returns the time since creation in ms"""
+        return self.watch.time()
+
+    def wait(self, duration):
+        """Blocks for duration ms"""
+        wait_time(duration)
+
+    def sleep(self, duration):
+        """Returns an awaitable sleeping duration ms in the event loop"""
+        return uasyncio.sleep_ms(round(duration))
+
+    def ticks(self):
+        """Returns the ticks in ms, the start of deadlines"""
+        return ticks_ms()
+
+    def deadline(self, start, elapsed):
+        """Returns the ticks elapsed ms after start, rounded to ms"""
+        return ticks_add(start, round(elapsed))
+
+    def wait_until(self, deadline):
+        """Blocks until the ticks of deadline"""
+        wait_time(max(0, ticks_diff(deadline, ticks_ms())))
+
+    def sleep_until(self, deadline):
+        """Returns an awaitable sleeping in the event loop until the
+        ticks of deadline
+        """
+        return uasyncio.sleep_ms(max(0, ticks_diff(deadline, ticks_ms())))
+
+
+class Plotter:
+    """Class responsible for registering a drawing canvas.
+    Motors need run, run_angle, hold, angle and speed like
+    pybricks.ev3devices.Motor, motor_z may be None.
+    """
+
+    def __init__(self, motor_x, motor_y, motor_z, lifted=False, clock=None,
+                 timer=None):
+        self.motor_x = motor_x
+        self.motor_y = motor_y
+        self.motor_z = motor_z
+        self.clock = clock if clock is not None else Clock()
+        # timing.PhaseTimer recording the phases of drawing, None disables it
+        self.timer = timer
+
+        self.current_x = X_LEFT_BOUND
+        self.current_y = Y_UPPER_BOUND
+
+        self.lifted = lifted
+
+        # errors of the last closed-loop execution
+        self.telemetry = None
+
+        # state of the asynchronous drawing, duration of its plan in ms
+        self.progress = None
+        self.duration = 0
+        self.cancelled = False
+
+        # self.move_to((X_RIGHT_BOUND, self.current_y))
+        # print('right top complete')
+        # wait_time(1000)
+        # self.move_to((self.current_x, Y_LOWER_BOUND))
+        # print('right bottom complete')
+        # wait_time(1000)
+        # self.move_to((X_LEFT_BOUND, self.current_y))
+        # print('left buttom complete')
+        # wait_time(1000)
+        # self.move_to((self.current_x, Y_UPPER_BOUND))
+        # print('left top complete')
+        # wait_time(1000)
+
+    def lift(self, wait=True):
+        """Lifts the pen if a z-motor is connected
+
+        :param wait: Wait for the maneuver to complete before continuing
+        with the rest of the program, defaults to True
+        :type wait: bool, optional
+        """
+        if not self.motor_z:
+            return
+        if self.lifted:
+            return
+
+        self.motor_z.run_angle(360, ANGLE_TO_LIFT, wait=wait)
+        self.lifted = True
+
+    def lower(self, wait=True):
+        """Lowers the pen if a z-motor is connected
+
+        :param wait: Wait for the maneuver to complete before continuing
+        with the rest of the program, defaults to True
+        :type wait: bool, optional
+        """
+        if not self.motor_z:
+            return
+        if not self.lifted:
+            return
+
+        self.motor_z.run_angle(360, -ANGLE_TO_LIFT, wait=wait)
+        self.lifted = False
+
+    async def lift_async(self):
+        """Lifts the pen like lift, sleeping in the event loop meanwhile"""
+        if self.motor_z and not self.lifted:
+            self.lift(wait=False)
+            await self.clock.sleep(LIFT_TIME)
+
+    async def lower_async(self):
+        """Lowers the pen like lower, sleeping in the event loop meanwhile"""
+        if self.motor_z and self.lifted:
+            self.lower(wait=False)
+            await self.clock.sleep(LIFT_TIME)
+
+    def move_to(self, coords, wait=True, parallel=False):
+        """Moves to given Coords and updates current values. Retains lifted status.
+
+        :param coords: Coords
+        :type coords: tuple[int, int]
+        :param wait: _description_, defaults to True
+        :type wait: bool, optional
+        :param parallel: Wait for the maneuver to complete before continuing
+        with the rest of the program, defaults to True
+        :type parallel: bool, optional
+        :raises ValueError: Values are out of bounds
+        """
+        x, y = coords
+        # same position, no movement needed
+        if x == self.current_x and y == self.current_y:
+            return
+
+        if not (X_LEFT_BOUND <= x <= X_RIGHT_BOUND or Y_LOWER_BOUND <= y <= Y_UPPER_BOUND):
+            raise ValueError('Values out of bounds')
+
+        angle_x = (x - self.current_x) / angle_ratio['x']
+        angle_y = (y - self.current_y) / angle_ratio['y']
+        logger.debug('Angle X: {} Angle Y: {}', angle_x, angle_y)
+        if logger.trace is not None:
+            logger.trace.record(logger.MOVE, angle_x, angle_y)
+
+        # make sure to lift before moving, but retain old lift status
+        was_lifted = self.lifted
+        if not self.lifted:
+            self.lift()
+
+        self.motor_x.run_angle(X_MAX_ANGLE_SPEED, angle_x, wait=not parallel)
+        self.motor_y.run_angle(Y_MAX_ANGLE_SPEED, angle_y, wait=wait)
+
+        if not was_lifted:
+            self.lower()
+
+        self.current_x = x
+        self.current_y = y
+
+
+    def plan(self, expr):
+        """Plans the drawing of a function before moving.
+        Finds the ranges where the function can be visible and samples
+        the curve there with steps adapted to its curvature, using the
+        first and second derivative. The samples are split into strokes
+        where the curve leaves the canvas or isn't defined, so the pen is
+        lifted across the gaps. Without a z-motor the curve stays one
+        stroke, the y-motor stops at the border instead. Every chord between the samples of a
+        stroke becomes a segment, driven with the slower motor at its
+        maximum speed, retaining the x to y ratio. Finally, segments are
+        slowed down ahead of steep sections to respect the acceleration
+        limits of the motors.
+        The plans are kept in the cache entry of the expression,
+        so drawing it again starts without calculations.
+
+        :param expr: Expression to draw
+        :type expr: Expression
+        :return: Plans of the strokes from left to right, empty if
+        nothing is visible
+        :rtype: list[motion.Plan]
+        """
+        # plans without a z-motor differ, they are cached separately
+        key = 'plans' if self.motor_z else 'plan'
+        entry = expr.cached
+        if entry is not None and key in entry:
+            return entry[key]
+
+        timer = self.timer
+        if timer is not None:
+            ticks = timer.start()
+
+        # compiled closures of the function and its derivatives
+        f = expr.compile()
+        f_prime = expr.derivative(1).compile()
+        f_second = expr.derivative(2).compile()
+        if timer is not None:
+            ticks = timer.lap(timing.COMPILE, ticks)
+
+        ranges = expr.visible_ranges(
+            X_LEFT_BOUND, X_RIGHT_BOUND, Y_LOWER_BOUND, Y_UPPER_BOUND,
+            X_LENGTH / PRECISION)
+        if timer is not None:
+            ticks = timer.lap(timing.START, ticks)
+
+        strokes = []
+        for lower, upper in ranges:
+            points = motion.adaptive_samples(
+                f, f_prime, f_second, lower, upper,
+                CHORD_TOLERANCE, MIN_STEP, MAX_STEP)
+            strokes.extend(motion.split_strokes(
+                f, points, (Y_LOWER_BOUND, Y_UPPER_BOUND), EDGE_TOLERANCE))
+        if strokes and not self.motor_z:
+            # the pen can't be lifted, so never travel across a gap, but
+            # stop the y-motor at the border like a single stroke
+            strokes = [motion.adaptive_samples(
+                f, f_prime, f_second, strokes[0][0][0], strokes[-1][-1][0],
+                CHORD_TOLERANCE, MIN_STEP, MAX_STEP)]
+        if timer is not None:
+            ticks = timer.lap(timing.SAMPLE, ticks)
+
+        plans = []
+        for points in strokes:
+            plan = motion.plan_motion(
+                points,
+                (angle_ratio['x'], angle_ratio['y']),
+                (X_MAX_ANGLE_SPEED, Y_MAX_ANGLE_SPEED),
+                (Y_LOWER_BOUND, Y_UPPER_BOUND)
+            )
+            if len(plan):
+                plans.append(motion.limit_acceleration(plan, max_angle_acceleration))
+        if timer is not None:
+            timer.lap(timing.MOTION, ticks)
+        if entry is not None:
+            entry[key] = plans
+        return plans
+
+    def order(self, plans):
+        """Orders the strokes of one or several functions, starting next
+        to the pen, so the pen-up travel between them is short.
+
+        :param plans: Plans of the strokes
+        :type plans: list[motion.Plan]
+        :return: Plans in drawing order, some of them reversed
+        :rtype: list[motion.Plan]
+        """
+        return motion.order_plans(
+            plans, (self.current_x, self.current_y),
+            (X_MAX_ANGLE_SPEED * angle_ratio['x'], Y_MAX_ANGLE_SPEED * angle_ratio['y']))
+
+    def travel_time(self, coords):
+        """Calculates the time move_to needs to reach the coords.
+
+        :param coords: Coords
+        :type coords: tuple[int, int]
+        :return: Time in ms
+        :rtype: int
+        """
+        x, y = coords
+        return int(1000 * max(
+            abs(x - self.current_x) / angle_ratio['x'] / X_MAX_ANGLE_SPEED,
+            abs(y - self.current_y) / angle_ratio['y'] / Y_MAX_ANGLE_SPEED
+        ))
+
+    def route(self, coords):
+        """Returns the points to move to one after another on the way to
+        coords. Without a z-motor the pen stays down, so it follows the
+        border of the canvas instead of drawing across it.
+
+        :param coords: Coords
+        :type coords: tuple[float, float]
+        :rtype: list[tuple[float, float]]
+        """
+        if self.motor_z or self.lifted:
+            return [coords]
+        return motion.border_route(
+            (self.current_x, self.current_y), coords,
+            (X_LEFT_BOUND, X_RIGHT_BOUND, Y_LOWER_BOUND, Y_UPPER_BOUND))
+
+    async def move_to_async(self, coords):
+        """Moves to given Coords like move_to, but hands control back to
+        the event loop while the motors are running.
+
+        :param coords: Coords
+        :type coords: tuple[int, int]
+        """
+        duration = self.travel_time(coords)
+        self.move_to(coords, wait=False, parallel=True)
+        await self.clock.sleep(duration)
+
+    def remaining(self):
+        """Estimates the remaining time of the asynchronous drawing.
+
+        :return: Time in ms
+        :rtype: int
+        """
+        return int(self.duration * (1 - (self.progress or 0)))
+
+    def stop(self):
+        """Stops both motors at their current position"""
+        self.motor_x.hold()
+        self.motor_y.hold()
+
+    def cancel(self):
+        """Cancels the running asynchronous drawing before its next segment"""
+        self.cancelled = True
+
+    def steps(self, plan, closed_loop=CLOSED_LOOP):
+        """Streams the segments of a plan to the motors, starting at the
+        current position. Doesn't wait itself, but yields how long to wait
+        until the next motor command, so it can be driven by blocking
+        waits or by the event loop.
+
+        :param plan: Plan of the drawing
+        :type plan: motion.Plan | motion.PlanFile
+        :param closed_loop: Correct the speeds with the measured motor
+        angles, defaults to CLOSED_LOOP
+        :type closed_loop: bool, optional
+        :yield: Time to wait in ms and the progress after waiting,
+        ranging from 0 - 1, or None in between segments
+        :rtype: tuple[float, float | None]
+        """
+        if closed_loop:
+            # yield from forwards close, so its finally stores the position
+            yield from self.steps_closed_loop(plan)
+            return
+
+        timer = self.timer
+        # checked once, so disabled logging costs nothing per segment
+        debug = logger.enabled(logger.DEBUG)
+        trace = logger.trace
+        total_time = plan.duration()
+        time_spent = 0
+        for duration, x_angle_speed, y_angle_speed in plan:
+            if timer is not None:
+                ticks = timer.start()
+            if debug:
+                logger.debug('X-Speed: {} Y-Speed: {}', x_angle_speed, y_angle_speed)
+            if trace is not None:
+                trace.record(logger.SEGMENT, x_angle_speed, y_angle_speed)
+            if timer is not None:
+                ticks = timer.lap(timing.PRINT, ticks)
+
+            self.motor_x.run(x_angle_speed)
+            self.motor_y.run(y_angle_speed)
+            if timer is not None:
+                timer.lap(timing.MOTOR, ticks)
+
+            # s = v · t
+            self.current_x += x_angle_speed * angle_ratio['x'] * duration / 1000
+            self.current_y += y_angle_speed * angle_ratio['y'] * duration / 1000
+
+            time_spent += duration
+            yield duration, time_spent / total_time
+
+    def steps_closed_loop(self, plan):
+        """Streams the segments of a plan to the motors, sampling the motor
+        angles every CONTROL_INTERVAL ms. The planned angles at the
+        elapsed time are compared with the measured ones and the speeds
+        are adjusted to correct the error. Errors are recorded in
+        self.telemetry and the current position is taken from the
+        motor angles afterwards, so no drift accumulates.
+
+        :param plan: Plan of the drawing, starting at the current position
+        :type plan: motion.Plan | motion.PlanFile
+        :yield: Time to wait in ms and the progress after waiting,
+        ranging from 0 - 1, or None in between segments
+        :rtype: tuple[float, float | None]
+        """
+        self.telemetry = motion.Telemetry()
+        origin_x = self.motor_x.angle()
+        origin_y = self.motor_y.angle()
+        correction = CORRECTION_GAIN * 1000 / CONTROL_INTERVAL
+
+        timer = self.timer
+        trace = logger.trace
+        total_time = plan.duration()
+        start = self.clock.time()
+        # planned angles and time at the start of the current segment
+        planned_x = planned_y = 0.0
+        segment_start = 0
+        try:
+            for duration, x_angle_speed, y_angle_speed in plan:
+                while True:
+                    now = self.clock.time() - start
+                    if now >= segment_start + duration:
+                        break
+
+                    if timer is not None:
+                        ticks = timer.start()
+                    elapsed = (now - segment_start) / 1000
+                    error_x = planned_x + x_angle_speed * elapsed - (self.motor_x.angle() - origin_x)
+                    error_y = planned_y + y_angle_speed * elapsed - (self.motor_y.angle() - origin_y)
+                    self.telemetry.record(
+                        (error_x, error_y),
+                        (x_angle_speed - self.motor_x.speed(), y_angle_speed - self.motor_y.speed())
+                    )
+                    if trace is not None:
+                        trace.record(logger.CORRECTION, error_x, error_y)
+                    if timer is not None:
+                        ticks = timer.lap(timing.FEEDBACK, ticks)
+
+                    self.motor_x.run(x_angle_speed + correction * error_x)
+                    self.motor_y.run(y_angle_speed + correction * error_y)
+                    if timer is not None:
+                        timer.lap(timing.MOTOR, ticks)
+                    yield min(CONTROL_INTERVAL, segment_start + duration - now), None
+
+                planned_x += x_angle_speed * duration / 1000
+                planned_y += y_angle_speed * duration / 1000
+                segment_start += duration
+                yield 0, segment_start / total_time
+        finally:
+            # also reached if the drawing is cancelled
+            self.current_x = plan.start[0] + (self.motor_x.angle() - origin_x) * angle_ratio['x']
+            self.current_y = plan.start[1] + (self.motor_y.angle() - origin_y) * angle_ratio['y']
+
+    def execute(self, plans, closed_loop=CLOSED_LOOP):
+        """Draws the strokes one after another. The pen is lifted, moved
+        to the start of a stroke (along the border without a z-motor,
+        see route) and lowered, then the segments are
+        streamed to the motors. No calculations besides bookkeeping
+        happen between the motor commands. The pen is lifted afterwards.
+
+        :param plans: Plans of the strokes in drawing order
+        :type plans: list[motion.Plan | motion.PlanFile]
+        :param closed_loop: Correct the speeds with the measured motor
+        angles, defaults to CLOSED_LOOP
+        :type closed_loop: bool, optional
+        :yield: Progress of drawing. Ranging from 0 - 1.
+        :rtype: float
+        """
+        total_time = sum(plan.duration() for plan in plans)
+        time_spent = 0
+        timer = self.timer
+        for plan in plans:
+            self.lift()
+            for point in self.route(plan.start):
+                self.move_to(point)
+            self.lower()
+
+            duration_plan = plan.duration()
+            start = self.clock.ticks()
+            elapsed = 0
+            for duration, percentage in self.steps(plan, closed_loop):
+                if timer is not None:
+                    ticks = timer.start()
+                elapsed += duration
+                self.clock.wait_until(self.clock.deadline(start, elapsed))
+                if timer is not None:
+                    timer.lap(timing.WAIT, ticks)
+                if percentage is not None:
+                    yield (time_spent + percentage * duration_plan) / total_time
+            time_spent += duration_plan
+            self.stop()
+        self.lift()
+
+    async def execute_async(self, plans, closed_loop=CLOSED_LOOP):
+        """Like execute, but sleeps in the event loop between the motor
+        commands, so other connections are served while drawing.
+        Progress is stored in self.progress. Stops before the next
+        motor command if cancel was called.
+
+        :param plans: Plans of the strokes in drawing order
+        :type plans: list[motion.Plan | motion.PlanFile]
+        :param closed_loop: Correct the speeds with the measured motor
+        angles, defaults to CLOSED_LOOP
+        :type closed_loop: bool, optional
+        :return: True if the plans were executed completely
+        :rtype: bool
+        """
+        self.duration = sum(plan.duration() for plan in plans)
+        time_spent = 0
+        timer = self.timer
+        for plan in plans:
+            await self.lift_async()
+            for point in self.route(plan.start):
+                await self.move_to_async(point)
+            await self.lower_async()
+
+            duration_plan = plan.duration()
+            steps = self.steps(plan, closed_loop)
+            start = self.clock.ticks()
+            elapsed = 0
+            for duration, percentage in steps:
+                if timer is not None:
+                    ticks = timer.start()
+                elapsed += duration
+                await self.clock.sleep_until(self.clock.deadline(start, elapsed))
+                if timer is not None:
+                    timer.lap(timing.WAIT, ticks)
+                if percentage is not None:
+                    self.progress = (time_spent + percentage * duration_plan) / self.duration
+                if self.cancelled:
+                    steps.close()
+                    self.stop()
+                    await self.lift_async()
+                    return False
+            time_spent += duration_plan
+            self.stop()
+        await self.lift_async()
+        return True
+
+    def draw(self, expr):
+        """Main Logic. Draws the function on the paper.
+        Plans the whole drawing first, then executes the plan,
+        so the motion timing doesn't depend on the calculations.
+
+        :param expr: Expression to draw
+        :type expr: Expression
+        :yield: Progress of drawing. Ranging from 0 - 1.
+        :rtype: float
+        """
+        for percentage in self.draw_batch((expr,)):
+            yield percentage
+
+    def plan_batch(self, exprs):
+        """Plans several functions together, their strokes are ordered
+        across all of them to shorten the travel between them.
+
+        :param exprs: Expressions to draw
+        :type exprs: list[Expression]
+        :return: Plans of the strokes in drawing order, empty if
+        nothing is visible
+        :rtype: list[motion.Plan]
+        """
+        started = self.clock.time()
+        plans = []
+        for expr in exprs:
+            plans.extend(self.plan(expr))
+        logger.info('Planning time (ms): {}', self.clock.time() - started)
+        return self.order(plans)
+
+    def draw_batch(self, exprs):
+        """Draws several functions in one session, e.g. a function and
+        its derivative. The pen only returns to the corner after the
+        last stroke.
+
+        :param exprs: Expressions to draw
+        :type exprs: list[Expression]
+        :yield: Progress of the whole batch. Ranging from 0 - 1.
+        :rtype: float
+        """
+        self.lift()
+        plans = self.plan_batch(exprs)
+        if not plans:
+            return
+
+        for percentage in self.draw_plans(plans):
+            yield percentage
+
+    def draw_plans(self, plans):
+        """Draws precomputed plans, e.g. motion.PlanFile created on
+        a host with motion.save_plan, without any calculations.
+
+        :param plans: Plans of the strokes in drawing order
+        :type plans: list[motion.Plan | motion.PlanFile]
+        :yield: Progress of drawing. Ranging from 0 - 1.
+        :rtype: float
+        """
+        for percentage in self.execute(plans):
+            yield percentage
+
+        if logger.trace is not None:
+            logger.trace.flush()
+
+        logger.debug('Position after drawing: {} {}', self.current_x, self.current_y)
+        self.clock.wait(5000)
+
+        for point in self.route((X_LEFT_BOUND, Y_UPPER_BOUND)):
+            self.move_to(point)
+
+    async def draw_async(self, expr):
+        """Draws the function like draw, as a coroutine yielding to the
+        event loop between segments. Planning still runs in one piece.
+
+        :param expr: Expression to draw
+        :type expr: Expression
+        :return: True if the drawing was completed, False if nothing is
+        visible or it was cancelled
+        :rtype: bool
+        """
+        return await self.draw_batch_async((expr,))
+
+    async def draw_batch_async(self, exprs):
+        """Draws several functions like draw_batch, as a coroutine
+        yielding to the event loop between segments.
+
+        :param exprs: Expressions to draw
+        :type exprs: list[Expression]
+        :return: True if the drawing was completed, False if nothing is
+        visible or it was cancelled
+        :rtype: bool
+        """
+        self.cancelled = False
+        self.progress = 0
+        self.lift()
+
+        plans = self.plan_batch(exprs)
+        if not plans:
+            return False
+
+        completed = await self.execute_async(plans)
+        if logger.trace is not None:
+            logger.trace.flush()
+        if completed:
+            await self.clock.sleep(5000)
+
+        for point in self.route((X_LEFT_BOUND, Y_UPPER_BOUND)):
+            await self.move_to_async(point)
+        return completed
@@ -23,11 +23,16 @@ class EchoServerProtocol(asyncio.Protocol):
         return super().connection_lost(exc)
     
     async def send_progress(self):
-        for x in range(255):
-            byte = (x).to_bytes(1, 'big', signed=False)
-            self.transport.write(byte)
-            print(byte)
+        # same JSON lines as the stream of the brick
+        for x in range(101):
+            line = json.dumps({
+                'id': 1, 'status': 'drawing', 'progress': x / 100,
+                'x': x, 'y': 0, 'eta': (100 - x) * 100
+            }) + '\n'
+            self.transport.write(line.encode('ascii'))
+            print(line)
             await asyncio.sleep(0.1)
+        self.transport.write(b'{"id": 1, "status": "done"}\n')
 
 
 
@@ -0,0 +1,238 @@
+"""
+Simulation of the plotter on a host. Drives the real Plotter with
+simulated motors, whose speed and acceleration are limited, and a clock
+advancing in fixed steps. Reports how far the drawn path deviates from
+the function and how long drawing takes, including lifting the pen
+and moving between strokes.
+"""
+
+import math
+
+import motion
+import plotter
+
+# physical limits of the simulated motors
+MOTOR_MAX_SPEED = 1000  # °/s
+# the motors accelerate faster than the planner allows, so the reports
+# measure the plotter, not motors saturating on every speed change
+ACCELERATION_MARGIN = 2
+MOTOR_MAX_ACCELERATION = ACCELERATION_MARGIN * max(plotter.max_angle_acceleration)  # °/s²
+# resolution of the simulation in ms
+TIME_STEP = 1
+
+
+class SimulatedClock:
+    """Clock advancing only when waiting, moving all motors on the way.
+
+    :param step: Time step in ms, defaults to TIME_STEP
+    :type step: float, optional
+    """
+
+    def __init__(self, step=TIME_STEP):
+        self.step = step
+        self.now = 0.0
+        self.motors = []
+        # called with the time after every step
+        self.listeners = []
+
+    def time(self):
+        """Returns the simulated time in ms"""
+        return self.now
+
+    def wait(self, duration):
+        """Advances the time by duration ms"""
+        end = self.now + duration
+        while self.now < end:
+            step = min(self.step, end - self.now)
+            for motor in self.motors:
+                motor.advance(step / 1000)
+            self.now += step
+            for listener in self.listeners:
+                listener(self.now)
+
+    async def sleep(self, duration):
+        """Advances the time by duration ms, without yielding"""
+        self.wait(duration)
+
+    def ticks(self):
+        """Returns the simulated time in ms, the start of deadlines"""
+        return self.now
+
+    def deadline(self, start, elapsed):
+        """Returns the time elapsed ms after start, rounded to ms"""
+        return start + round(elapsed)
+
+    def wait_until(self, deadline):
+        """Advances the time up to deadline"""
+        if deadline > self.now:
+            self.wait(deadline - self.now)
+
+    async def sleep_until(self, deadline):
+        """Advances the time up to deadline, without yielding"""
+        self.wait_until(deadline)
+
+
+class SimulatedMotor:
+    """Motor with the interface of pybricks.ev3devices.Motor used by the
+    Plotter. Speed changes are limited by max_acceleration, commanded
+    speeds by max_speed.
+
+    :param clock: Clock moving the motor
+    :type clock: SimulatedClock
+    """
+
+    def __init__(self, clock, max_speed=MOTOR_MAX_SPEED,
+                 max_acceleration=MOTOR_MAX_ACCELERATION):
+        self.clock = clock
+        self.max_speed = max_speed
+        self.max_acceleration = max_acceleration
+        self._angle = 0.0
+        self._speed = 0.0
+        self._command = 0.0
+        # angle to reach with run_angle, None while running with run
+        self._target = None
+        clock.motors.append(self)
+
+    def angle(self):
+        return self._angle
+
+    def speed(self):
+        return self._speed
+
+    def run(self, speed):
+        self._target = None
+        self._command = speed
+
+    def hold(self):
+        self._target = None
+        self._command = 0.0
+
+    def run_angle(self, speed, rotation_angle, then=None, wait=True):
+        self._target = self._angle + rotation_angle
+        self._command = math.copysign(abs(speed), rotation_angle)
+        while wait and self._target is not None:
+            self.clock.wait(self.clock.step)
+
+    def advance(self, seconds):
+        """Moves the motor for the given time"""
+        command = max(-self.max_speed, min(self._command, self.max_speed))
+        if self._target is not None:
+            remaining = self._target - self._angle
+            if abs(remaining) < 0.5 and abs(self._speed) < self.max_acceleration * seconds:
+                self._angle = self._target
+                self._speed = self._command = 0.0
+                self._target = None
+                return
+            # slow down in time to stop at the target
+            braking = math.sqrt(2 * self.max_acceleration * abs(remaining))
+            command = math.copysign(min(abs(command), braking), remaining)
+
+        change = self.max_acceleration * seconds
+        self._speed += max(-change, min(command - self._speed, change))
+        self._angle += self._speed * seconds
+
+
+class Simulation:
+    """Plotter with simulated motors, tracing the pen while it is lowered.
+
+    :param max_speed: Limit of the motors in °/s, defaults to MOTOR_MAX_SPEED
+    :type max_speed: float, optional
+    :param max_acceleration: Limit of the motors in °/s²,
+    defaults to MOTOR_MAX_ACCELERATION
+    :type max_acceleration: float, optional
+    :param step: Time step in ms, defaults to TIME_STEP
+    :type step: float, optional
+    """
+
+    def __init__(self, max_speed=MOTOR_MAX_SPEED,
+                 max_acceleration=MOTOR_MAX_ACCELERATION, step=TIME_STEP):
+        self.clock = SimulatedClock(step)
+        self.motor_x = SimulatedMotor(self.clock, max_speed, max_acceleration)
+        self.motor_y = SimulatedMotor(self.clock, max_speed, max_acceleration)
+        self.motor_z = SimulatedMotor(self.clock, max_speed, max_acceleration)
+        self.plotter = plotter.Plotter(
+            self.motor_x, self.motor_y, self.motor_z, lifted=True, clock=self.clock)
+        # position of the pen at motor angles 0
+        self.origin = (self.plotter.current_x, self.plotter.current_y)
+        # traced path of every stroke
+        self.paths = []
+        self.clock.listeners.append(self._trace)
+        self._tracing = False
+        self._path = None
+
+    def position(self):
+        """Returns the actual position of the pen in mm"""
+        return (
+            self.origin[0] + self.motor_x.angle() * plotter.angle_ratio['x'],
+            self.origin[1] + self.motor_y.angle() * plotter.angle_ratio['y']
+        )
+
+    def _trace(self, _):
+        if not self._tracing or self.plotter.lifted:
+            self._path = None
+            return
+        if self._path is None:
+            self._path = []
+            self.paths.append(self._path)
+        self._path.append(self.position())
+
+    def draw(self, expr, closed_loop=plotter.CLOSED_LOOP):
+        """Plans and executes the drawing of a function, tracing the pen
+        while the strokes are drawn.
+
+        :param expr: Expression to draw
+        :type expr: Expression
+        :param closed_loop: Use the closed-loop execution,
+        defaults to plotter.CLOSED_LOOP
+        :type closed_loop: bool, optional
+        :return: Report, see report, None if nothing is visible
+        :rtype: dict | None
+        """
+        plans = self.plotter.plan(expr)
+        if not plans:
+            return None
+        plans = self.plotter.order(plans)
+
+        self.paths = []
+        started = self.clock.time()
+        self._tracing = True
+        for _ in self.plotter.execute(plans, closed_loop):
+            pass
+        self._tracing = False
+
+        report = self.report(expr.compile())
+        report['time'] = self.clock.time() - started
+        report['planned_time'] = sum(plan.duration() for plan in plans)
+        report['segments'] = sum(len(plan) for plan in plans)
+        report['strokes'] = len(plans)
+        return report
+
+    def report(self, f):
+        """Compares the traced path with the function. The error of a
+        point is its vertical distance to f, clamped to the y bounds
+        like the plan. Points where f is not defined or not real are
+        skipped.
+
+        :param f: Function
+        :type f: Callable[[float], float]
+        :return: Maximum and root mean square error in mm, number of
+        compared points
+        :rtype: dict
+        """
+        squared = 0.0
+        maximum = 0.0
+        count = 0
+        for x, y in (point for path in self.paths for point in path):
+            expected = motion._evaluate(f, x)
+            if expected is None:
+                continue
+            expected = min(max(expected, plotter.Y_LOWER_BOUND), plotter.Y_UPPER_BOUND)
+            error = abs(y - expected)
+            maximum = max(maximum, error)
+            squared += error * error
+            count += 1
+        return {
+            'max_error': maximum,
+            'rms_error': math.sqrt(squared / count) if count else 0.0,
+            'points': count
+        }
@@ -0,0 +1,87 @@
+"""
+Tests of the motion planning, run on a host with pytest.
+"""
+import plotter
+import motion
+from calculus.expression import Expression
+
+ACCELERATION = plotter.max_angle_acceleration
+# relative tolerance, the passes of limit_acceleration converge but
+# stop after a few
+TOLERANCE = 1e-2
+
+
+def _plans(text):
+    """Returns the plan of a function before and after limiting the
+    acceleration
+    """
+    expr = Expression(text)
+    points = motion.adaptive_samples(
+        expr.compile(), expr.derivative(1).compile(), expr.derivative(2).compile(),
+        plotter.X_LEFT_BOUND, plotter.X_RIGHT_BOUND,
+        plotter.CHORD_TOLERANCE, plotter.MIN_STEP, plotter.MAX_STEP)
+    plan = motion.plan_motion(
+        points,
+        (plotter.angle_ratio['x'], plotter.angle_ratio['y']),
+        (plotter.X_MAX_ANGLE_SPEED, plotter.Y_MAX_ANGLE_SPEED),
+        (plotter.Y_LOWER_BOUND, plotter.Y_UPPER_BOUND))
+    return plan, motion.limit_acceleration(plan, ACCELERATION)
+
+
+def _slack(speed, neighbour, change):
+    """Remaining speed change allowed, negative if the limit is violated.
+    The faster of two segments ramps between their speeds within its own
+    duration, a reversal ramps through 0.
+    """
+    if speed * neighbour < 0:
+        neighbour = 0.0
+    return change - (abs(speed) - abs(neighbour))
+
+
+def _slacks(plan, limited, index):
+    """Slacks of a segment towards both neighbours on both axes, in
+    units of the allowed change, which limit_acceleration bases on the
+    planned duration
+    """
+    duration = plan[index][0]
+    slacks = []
+    for axis in (1, 2):
+        change = ACCELERATION[axis - 1] / 1000 * duration
+        speed = limited[index][axis]
+        before = limited[index - 1][axis] if index > 0 else 0.0
+        after = limited[index + 1][axis] if index + 1 < len(limited) else 0.0
+        slacks.append(_slack(speed, before, change) / change)
+        slacks.append(_slack(speed, after, change) / change)
+    return slacks
+
+
+def test_reversals_respect_the_limit():
+    for text in ('20*sin(0.3*x)', '0.1*x^2', '15*sin(0.1*x)'):
+        plan, limited = _plans(text)
+        for index in range(len(limited)):
+            assert min(_slacks(plan, limited, index)) > -TOLERANCE, (text, index)
+
+
+def test_reversals_are_not_slowed_more_than_required():
+    for text in ('20*sin(0.3*x)', '0.1*x^2', '15*sin(0.1*x)'):
+        plan, limited = _plans(text)
+        for index in range(len(limited)):
+            if limited[index][0] > plan[index][0] * (1 + TOLERANCE):
+                # slowed down, so one of its limits is reached
+                assert min(_slacks(plan, limited, index)) < TOLERANCE, (text, index)
+
+
+def test_reversed_plan():
+    plan, _ = _plans('20*sin(0.3*x)')
+    reverse = plan.reversed()
+    assert reverse.start == plan.end and reverse.end == plan.start
+    assert reverse.reversed().segments == plan.segments
+
+
+def test_complex_results_are_not_drawn():
+    expr = Expression('x^0.5')
+    points = motion.adaptive_samples(
+        expr.compile(), expr.derivative(1).compile(), expr.derivative(2).compile(),
+        -10.0, 10.0, plotter.CHORD_TOLERANCE, plotter.MIN_STEP, plotter.MAX_STEP)
+    for x, y in points:
+        assert y is None or (x >= 0 and isinstance(y, float)), (x, y)
@@ -0,0 +1,109 @@
+"""
+Opt-in timing of the phases of a drawing. Durations are recorded with
+ticks_us into a preallocated ring buffer, so recording doesn't allocate
+memory while drawing. Summaries with histograms are built on request.
+"""
+
+from array import array
+
+try:
+    from utime import ticks_diff, ticks_us
+except ImportError:
+    import time
+
+    def ticks_us():
+        return time.perf_counter_ns() // 1000
+
+    def ticks_diff(end, start):
+        return end - start
+
+# phases of planning
+COMPILE = 0
+START = 1
+SAMPLE = 2
+MOTION = 3
+# phases of a segment while executing
+PRINT = 4
+MOTOR = 5
+FEEDBACK = 6
+WAIT = 7
+
+PHASES = ('compile', 'start', 'sample', 'motion', 'print', 'motor', 'feedback', 'wait')
+
+# recorded durations kept
+CAPACITY = 1024
+# histogram buckets: below 1 µs, below 2 µs, ..., below 2^(BUCKETS - 1) µs
+BUCKETS = 24
+
+
+class PhaseTimer:
+    """Ring buffer of phase durations in µs.
+
+    :param capacity: Number of durations kept, defaults to CAPACITY
+    :type capacity: int, optional
+    """
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.phases = array('B', [0]) * capacity
+        self.durations = array('I', [0]) * capacity
+        # number of recorded durations, the oldest are overwritten
+        self.count = 0
+
+    def start(self):
+        """Returns the current ticks, starting a phase"""
+        return ticks_us()
+
+    def lap(self, phase, start):
+        """Records the duration of a phase and starts the next one.
+
+        :param phase: Phase, e.g. MOTOR
+        :type phase: int
+        :param start: Ticks returned by start or lap
+        :type start: int
+        :return: Current ticks
+        :rtype: int
+        """
+        now = ticks_us()
+        index = self.count % self.capacity
+        self.phases[index] = phase
+        self.durations[index] = ticks_diff(now, start)
+        self.count += 1
+        return now
+
+    def clear(self):
+        self.count = 0
+
+    def summary(self):
+        """Summarizes the recorded durations per phase.
+
+        :return: Per phase name: count, total, mean and max in µs and
+        the histogram, counts of durations below 1, 2, 4, ... µs
+        :rtype: dict[str, dict]
+        """
+        result = dict()
+        for index in range(min(self.count, self.capacity)):
+            duration = self.durations[index]
+            name = PHASES[self.phases[index]]
+            entry = result.get(name)
+            if entry is None:
+                entry = {'count': 0, 'total': 0, 'max': 0, 'histogram': [0] * BUCKETS}
+                result[name] = entry
+            entry['count'] += 1
+            entry['total'] += duration
+            entry['max'] = max(entry['max'], duration)
+            bucket = min(_bit_length(duration), BUCKETS - 1)
+            entry['histogram'][bucket] += 1
+
+        for entry in result.values():
+            entry['mean'] = entry['total'] / entry['count']
+        return result
+
+
+def _bit_length(value):
+    """int.bit_length, which MicroPython lacks"""
+    length = 0
+    while value:
+        value >>= 1
+        length += 1
+    return length